@@ -1,1332 +1,1778 @@
 import html
 import json
 import os
+import re
 import sys
+import time
 import uuid
 import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Dict, Any, List, Union
 from urllib.parse import urljoin
 
+import orjson
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from deepdiff import DeepDiff
-from deepdiff.helper import SetOrdered
+from deepdiff.helper import SetOrdered, add_root_to_paths
+from deepdiff.path import parse_path
 
+try:
+    from diff_match_patch import diff_match_patch
+except ImportError:  # dependência opcional (extra "diff"); sem ela o difflib é usado
+    diff_match_patch = None
 
-class TestResult:
-    """Resultado de um teste individual"""
-    def __init__(self, test_name: str):
-        self.test_name = test_name
-        self.success = False
-        self.status_code = None
-        self.response_data = None
-        self.response_headers = None
-        self.error_message = None
-        self.execution_time = 0.0
-        self.timestamp = datetime.now().isoformat()
-        self.request_details = {}
-        self.response_details = {}
-        self.validation_details = {}
+# Placeholders no formato {{variavel}}
+_VARIABLE_RE = re.compile(r'\{\{([^{}]+)\}\}')
 
+# Inteiros com 19+ dígitos podem não caber em 64 bits; o orjson os converteria em float
+_LONG_INT_RE = re.compile(rb'(?<![\d.eE+-])-?\d{19,}(?![\d.eE])')
 
-class ComparisonResult:
-    """Resultado de uma comparação entre endpoints"""
-    def __init__(self, comparison_name: str):
-        self.comparison_name = comparison_name
-        self.success = False
-        self.timestamp = datetime.now().isoformat()
-        self.endpoints_results = []
-        self.comparison_details = {
-            'status_match': False,
-            'body_match': False,
-            'differences': None,
-            'ignored_fields': []
-        }
-        self.error_message = None
+# Opções do orjson compartilhadas: saída legível (arquivos, console, relatórios) e forma canônica (comparação)
+_ORJSON_OPT_PRETTY = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+_ORJSON_OPT_CANONICAL = orjson.OPT_SORT_KEYS
 
+# Loader seguro em C (libyaml) quando o PyYAML foi compilado com ele
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-class APIComparator:
-    """API Comparator - Compare and validate API endpoints with visual diff reporting"""
-    
-    def __init__(self, config_file: str = "api_comparator_config.yaml"):
-        self.config_file = config_file
-        self.config = self._load_config()
-        self.results: List[TestResult] = []
-        self.comparison_results: List[ComparisonResult] = []
-        self.session = requests.Session()
-        self.variables = {}
-        self._setup_session()
-    
-    def _load_config(self) -> Dict[str, Any]:
-        """Carrega a configuração do arquivo YAML"""
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            print(f"Erro: Arquivo {self.config_file} não encontrado!")
-            sys.exit(1)
-        except yaml.YAMLError as e:
-            print(f"Erro ao ler YAML: {e}")
-            sys.exit(1)
-    
-    def _setup_session(self):
-        """Configura a sessão HTTP com headers globais"""
-        config = self.config.get('config', {})
+
+def _json_default(obj):
+    """Serializa tipos que o orjson não conhece (SetOrdered e classes nos resultados do DeepDiff)"""
+    if isinstance(obj, SetOrdered):
+        return list(obj)
+    return str(obj)
+
+
+def _dumps_pretty(obj) -> bytes:
+    """Serializa de forma legível com orjson; inteiros acima de 64 bits caem para o json padrão"""
+    try:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPT_PRETTY)
+    except TypeError:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _esc(text: str) -> str:
+    """Escapa texto para o conteúdo de elementos HTML; sem <, > ou & devolve o próprio texto"""
+    # Fora de atributos as aspas não precisam de escape
+    if '&' in text or '<' in text or '>' in text:
+        return html.escape(text, quote=False)
+    return text
+
+
+# Classe CSS do badge por família de status (1xx e desconhecidos caem em 5xx)
+_STATUS_CLASS = {2: "status-2xx", 3: "status-3xx", 4: "status-4xx", 5: "status-5xx"}
+
+# Bloco de detalhes do request de cada endpoint no relatório HTML de comparações
+_REQ_TMPL = (
+    '<div class="request-details">'
+    '<strong>🔗 Base URL:</strong> %s<br>'
+    '<strong>📍 Request:</strong> %s %s<br>'
+    '<strong>🌐 Full URL:</strong> %s<br>'
+    '%s%s'
+    '</div>'
+)
+_REQ_PARAM_TMPL = '&nbsp;&nbsp;&nbsp;&nbsp;• <code>%s</code> = <code>%s</code><br>'
+
+# Cabeçalho (CSS) do relatório HTML de comparações
+_HTML_HEADER = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Comparação de Endpoints</title>
+    <style>
+        * {
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            margin: 0;
+            padding: 1rem;
+            background-color: #f8f9fa;
+            line-height: 1.6;
+        }
+        .main-container {
+            max-width: 1400px;
+            margin: 0 auto;
+        }
+        h1 {
+            color: #2c3e50;
+            text-align: center;
+            margin-bottom: 1.5rem;
+            font-size: clamp(1.5rem, 4vw, 2.5rem);
+        }
+        h2 {
+            color: #34495e;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 0.625rem;
+            margin-top: 2.5rem;
+            font-size: clamp(1.25rem, 3vw, 1.75rem);
+        }
+        h3 {
+            margin-top: 0;
+            font-weight: bold;
+            font-size: clamp(1rem, 2.5vw, 1.25rem);
+        }
+        .comparison-container {
+            display: flex;
+            gap: 1.25rem;
+            margin-bottom: 2rem;
+            flex-wrap: wrap;
+        }
+        .endpoint-container {
+            flex: 1;
+            min-width: 300px;
+            border-radius: 8px;
+            padding: 1rem;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            background-color: white;
+            border: 2px solid #e0e0e0;
+        }
+        .status-badge {
+            display: inline-block;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-weight: bold;
+            font-size: 14px;
+            margin-bottom: 10px;
+        }
+        .status-2xx { background-color: #d4edda; color: #155724; }
+        .status-3xx { background-color: #fff3cd; color: #856404; }
+        .status-4xx { background-color: #f8d7da; color: #721c24; }
+        .status-5xx { background-color: #f8d7da; color: #721c24; }
+        .payload {
+            border-radius: 6px;
+            padding: 1rem;
+            overflow: auto;
+            max-height: 400px;
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 0.8125rem;
+            line-height: 1.6;
+            white-space: pre;
+            background-color: #f8f9fa;
+            border: 1px solid #dee2e6;
+            word-break: break-word;
+            overflow-wrap: break-word;
+        }
+        /* Linhas do diff: um span por linha dentro do .payload (white-space: pre) */
+        .d-u, .d-r, .d-a, .d-m {
+            display: inline-block;
+            min-width: 100%;
+            vertical-align: top;
+            padding: 0 5px;
+            border-left: 3px solid transparent;
+        }
+        .d-r {
+            background-color: #ffeaea;
+            border-left-color: #f56565;
+            color: #c53030;
+        }
+        .d-a {
+            background-color: #f0fff4;
+            border-left-color: #48bb78;
+            color: #2d7d32;
+        }
+        .d-m {
+            background-color: #fff8dc;
+            border-left-color: #ed8936;
+            color: #c05621;
+        }
+        .d-u {
+            color: #718096;
+        }
+        .char-removed {
+            background-color: #fed7d7;
+            text-decoration: line-through;
+        }
+        .char-added {
+            background-color: #c6f6d5;
+            font-weight: bold;
+        }
+        .char-modified {
+            background-color: #faf089;
+            font-weight: bold;
+        }
+        .differences {
+            background-color: #fff5f5;
+            border: 1px solid #fed7d7;
+            border-radius: 8px;
+            padding: 20px;
+            margin-top: 20px;
+        }
+        .differences h3 {
+            color: #c53030;
+            margin-top: 0;
+        }
+        .legend {
+            display: flex;
+            gap: 20px;
+            margin-bottom: 20px;
+            font-size: 12px;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            gap: 5px;
+        }
+        .legend-color {
+            width: 15px;
+            height: 15px;
+            border-radius: 3px;
+        }
+        .result-banner {
+            text-align: center;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 8px;
+            font-size: 18px;
+            font-weight: bold;
+        }
+        .result-success {
+            background-color: #d4edda;
+            color: #155724;
+            border: 2px solid #c3e6cb;
+        }
+        .result-failure {
+            background-color: #f8d7da;
+            color: #721c24;
+            border: 2px solid #f5c6cb;
+        }
         
-        # Headers globais
-        global_headers = config.get('headers', {})
-        self.session.headers.update(global_headers)
+        /* Request details box */
+        .request-details {
+            background-color: #f0f8ff;
+            border: 1px solid #cce7ff;
+            border-radius: 4px;
+            padding: 0.625rem;
+            margin-bottom: 0.625rem;
+            font-size: 0.75rem;
+            overflow-x: auto;
+        }
+        .request-details code {
+            background-color: #e9ecef;
+            padding: 0.125rem 0.25rem;
+            border-radius: 3px;
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 0.85em;
+            color: #495057;
+        }
         
-        # Variáveis globais
-        self.variables = config.get('variables', {})
+        /* Responsive design */
+        @media screen and (max-width: 1024px) {
+            .comparison-container {
+                gap: 1rem;
+            }
+            .endpoint-container {
+                min-width: 280px;
+            }
+        }
         
-        # Base URLs
-        self.base_url = config.get('base_url', 'http://localhost:8080')
-        self.base_url_comparison = config.get('base_url_comparison', None)
-        self.timeout = config.get('timeout', 30)
-    
-    def _replace_variables(self, text: Union[str, Dict, List], local_uuid = None) -> Union[str, Dict, List]:
-        """Substitui variáveis no formato {{variavel}} pelos valores"""
-        if isinstance(text, str):
-            # Substituir {{uuid}} por um novo UUID
-            if '{{uuid}}' in text:
-                if not local_uuid:
-                    text = text.replace('{{uuid}}', str(uuid.uuid4()))
-                else:
-                    text = text.replace('{{uuid}}', local_uuid)
-            
-            # Substituir outras variáveis
-            for key, value in self.variables.items():
-                placeholder = f"{{{{{key}}}}}"
-                if placeholder in text:
-                    text = text.replace(placeholder, str(value))
-            
-            return text
-        
-        elif isinstance(text, dict):
-            return {k: self._replace_variables(v, local_uuid) for k, v in text.items()}
-        
-        elif isinstance(text, list):
-            return [self._replace_variables(item, local_uuid) for item in text]
-        
-        return text
-    
-    def _build_url(self, path: str, path_params: Dict[str, str] = None) -> str:
-        """Constrói a URL completa com parâmetros de caminho"""
-        # Substituir variáveis no path
-        path = self._replace_variables(path)
-        
-        # Substituir parâmetros de caminho
-        if path_params:
-            for key, value in path_params.items():
-                placeholder = f"{{{key}}}"
-                path = path.replace(placeholder, str(self._replace_variables(value)))
-        
-        # Construir URL completa
-        return urljoin(self.base_url, path)
-    
-    def _validate_response(self, response: requests.Response, expected: Dict[str, Any]) -> tuple[bool, Dict[str, Any]]:
-        """Valida a resposta contra as expectativas e retorna detalhes da validação"""
-        validation_details = {
-            'validations_passed': [],
-            'validations_failed': [],
-            'overall_success': True
+        @media screen and (max-width: 768px) {
+            body {
+                padding: 0.5rem;
+            }
+            h1 {
+                margin-bottom: 1rem;
+            }
+            h2 {
+                margin-top: 1.5rem;
+                font-size: 1.5rem;
+            }
+            h3 {
+                font-size: 1.125rem;
+            }
+            .comparison-container {
+                flex-direction: column;
+                gap: 1rem;
+            }
+            .endpoint-container {
+                min-width: unset;
+                width: 100%;
+            }
+            .payload {
+                max-height: 300px;
+                font-size: 0.75rem;
+                padding: 0.75rem;
+            }
+            .legend {
+                flex-wrap: wrap;
+                gap: 0.75rem;
+                font-size: 0.75rem;
+            }
+            .result-banner {
+                font-size: 1rem;
+                padding: 0.75rem;
+            }
+            .request-details {
+                font-size: 0.6875rem;
+                padding: 0.5rem;
+            }
         }
         
-        if not expected:
-            validation_details['validations_passed'].append("Nenhuma validação configurada - teste aprovado")
-            return True, validation_details
-        
-        # Validar status code
-        if 'status_code' in expected:
-            expected_status = expected['status_code']
-            actual_status = response.status_code
-            if actual_status == expected_status:
-                validation_details['validations_passed'].append(f"Status code: {actual_status} (esperado: {expected_status})")
-            else:
-                validation_details['validations_failed'].append(f"Status code: {actual_status} (esperado: {expected_status})")
-                validation_details['overall_success'] = False
-        
-        # Validar headers
-        if 'headers' in expected:
-            for header, expected_value in expected['headers'].items():
-                actual_value = response.headers.get(header, '')
-                if expected_value.lower() in actual_value.lower():
-                    validation_details['validations_passed'].append(f"Header '{header}': contém '{expected_value}'")
-                else:
-                    validation_details['validations_failed'].append(f"Header '{header}': '{actual_value}' não contém '{expected_value}'")
-                    validation_details['overall_success'] = False
-        
-        # Validar corpo da resposta
-        if 'body' in expected:
-            try:
-                response_json = response.json()
-                
-                # Verificar se contém campos específicos
-                if 'contains' in expected['body']:
-                    for field in expected['body']['contains']:
-                        if field in str(response_json):
-                            validation_details['validations_passed'].append(f"Body contém: '{field}'")
-                        else:
-                            validation_details['validations_failed'].append(f"Body não contém: '{field}'")
-                            validation_details['overall_success'] = False
-                
-                # Verificar valores exatos
-                if 'exact' in expected['body']:
-                    for key, expected_value in expected['body']['exact'].items():
-                        actual_value = response_json.get(key)
-                        if actual_value == expected_value:
-                            validation_details['validations_passed'].append(f"Body['{key}']: {actual_value} (esperado: {expected_value})")
-                        else:
-                            validation_details['validations_failed'].append(f"Body['{key}']: {actual_value} (esperado: {expected_value})")
-                            validation_details['overall_success'] = False
-                
-            except json.JSONDecodeError:
-                validation_details['validations_failed'].append("Erro: esperava JSON mas a resposta não é um JSON válido")
-                validation_details['overall_success'] = False
-        
-        return validation_details['overall_success'], validation_details
-    
-    def _execute_request(self, test_config: Dict[str, Any]) -> requests.Response:
-        """Executa a requisição HTTP"""
-        request_config = test_config['request']
-        local_uuid =  test_config['local_uuid'] if 'local_uuid' in test_config else None
-        
-        # Preparar componentes da requisição
-        method = request_config['method'].upper()
-        # verifica se há comparison_path caso haja substitui usa na requisicao
-        # caso não usao path
-        if request_config.get("comparison_path",False):
-            path = request_config.get("comparison_path","/")
-        else:
-            path = request_config.get('path', '/')
-
-        path_params = self._replace_variables(request_config.get('path_params', {}), local_uuid)
-        
-        # Construir URL
-        url = self._build_url(path, path_params)
-        
-        # Headers específicos do teste
-        headers = self.session.headers.copy()
-        if 'headers' in request_config:
-            test_headers = self._replace_variables(request_config['headers'], local_uuid)
-            headers.update(test_headers)
-        
-        # Query parameters
-        params = self._replace_variables(request_config.get('query_params', {}), local_uuid)
-        
-        # Body da requisição
-        json_body = None
-        data = None
-        if 'body' in request_config:
-            body = self._replace_variables(request_config['body'], local_uuid)
-            if headers.get('Content-Type', '').lower() == 'application/json':
-                json_body = body
-            else:
-                data = body
-        
-        # Executar requisição
-        response = self.session.request(
-            method=method,
-            url=url,
-            headers=headers,
-            params=params,
-            json=json_body,
-            data=data,
-            timeout=self.timeout
-        )
-        
-        return response
-    
-    def _execute_test(self, test: Dict[str, Any]) -> TestResult:
-        """Executa um teste individual"""
-        result = TestResult(test['name'])
+        @media screen and (max-width: 480px) {
+            h1 {
+                font-size: 1.5rem;
+            }
+            h2 {
+                font-size: 1.25rem;
+            }
+            h3 {
+                font-size: 1rem;
+            }
+            .endpoint-container {
+                padding: 0.75rem;
+            }
+            .status-badge {
+                font-size: 0.75rem;
+                padding: 3px 8px;
+            }
+            .payload {
+                font-size: 0.6875rem;
+                padding: 0.5rem;
+            }
+        }
         
-        try:
-            # Executar requisição
-            start_time = datetime.now()
-            response = self._execute_request(test)
-            end_time = datetime.now()
+        /* Print styles */
+        @media print {
+            @page {
+                size: A4;
+                margin: 15mm;
+            }
             
-            result.execution_time = (end_time - start_time).total_seconds()
-            result.status_code = response.status_code
-            result.response_headers = dict(response.headers)
+            body {
+                background-color: white;
+                color: #000;
+                font-size: 10pt;
+                line-height: 1.4;
+                padding: 0;
+                margin: 0;
+            }
             
-            # Armazenar detalhes da requisição
-            result.request_details = {
-                'method': test['request']['method'],
-                'url': response.request.url,
-                'headers': dict(response.request.headers)
+            .main-container {
+                max-width: 100%;
+                margin: 0;
             }
             
-            # Adicionar body da requisição se existir
-            if response.request.body:
-                try:
-                    # Tentar decodificar como JSON se possível
-                    if isinstance(response.request.body, bytes):
-                        body_text = response.request.body.decode('utf-8')
-                        try:
-                            result.request_details['body'] = json.loads(body_text)
-                        except json.JSONDecodeError:
-                            result.request_details['body'] = body_text
-                    else:
-                        result.request_details['body'] = response.request.body
-                except Exception:
-                    result.request_details['body'] = str(response.request.body)
-            else:
-                result.request_details['body'] = None
+            h1 {
+                font-size: 20pt;
+                margin-bottom: 10pt;
+                page-break-after: avoid;
+            }
             
-            # Tentar parsear resposta como JSON
-            try:
-                result.response_data = response.json()
-            except json.JSONDecodeError:
-                result.response_data = response.text
-            
-            # Armazenar detalhes da resposta
-            result.response_details = {
-                'status_code': response.status_code,
-                'headers': result.response_headers,
-                'body': result.response_data
+            h2 {
+                font-size: 14pt;
+                margin-top: 15pt;
+                margin-bottom: 10pt;
+                page-break-after: avoid;
+                page-break-inside: avoid;
+                border-bottom: 1pt solid #333;
             }
             
-            # Validar resposta
-            expected = test.get('expected', {})
-            result.success, result.validation_details = self._validate_response(response, expected)
+            h3 {
+                font-size: 12pt;
+                margin-top: 10pt;
+                margin-bottom: 5pt;
+                page-break-after: avoid;
+            }
             
-            # Salvar arquivo se configurado
-            if expected.get('save_response_to') and response.content:
-                with open(expected['save_response_to'], 'wb') as f:
-                    f.write(response.content)
+            /* Evitar quebras de página ruins */
+            .comparison-container {
+                page-break-inside: avoid;
+                display: flex !important;
+                gap: 10pt;
+                margin-bottom: 15pt;
+            }
             
-        except requests.exceptions.RequestException as e:
-            result.success = False
-            result.error_message = f"Erro na requisição: {str(e)}"
-        except Exception as e:
-            result.success = False
-            result.error_message = f"Erro: {str(e)}"
-        
-        return result
-    
-    def _execute_comparison(self, comparison: Dict[str, Any]) -> ComparisonResult:
-        """Executa uma comparação entre endpoints"""
-        result = ComparisonResult(comparison['name'])
-        
-        try:
-            # Se há apenas um request e duas base_urls configuradas, usar ambas
-            local_uuid : str = str(uuid.uuid4())
-            if 'request' in comparison and self.base_url_comparison:
-                endpoints = [
-                    {
-                        'name': 'Host 1',
-                        'request': comparison['request'],
-                        'base_url': self.base_url,
-                    },
-                    {
-                        'name': 'Host 2', 
-                        'request': comparison['request'],
-                        'base_url': self.base_url_comparison,
-                    }
-                ]
-            else:
-                endpoints = comparison.get('endpoints', [])
+            .endpoint-container {
+                box-shadow: none;
+                border: 1pt solid #333;
+                padding: 8pt;
+                margin-bottom: 0;
+                page-break-inside: avoid;
+                background-color: white;
+                min-width: auto;
+                width: 48%;
+                flex: 1;
+            }
             
-            if len(endpoints) < 2:
-                result.error_message = "Comparação requer pelo menos 2 endpoints ou configuração base_url_comparison"
-                return result
+            /* Status badges em preto e branco */
+            .status-badge {
+                border: 1pt solid #333;
+                background-color: #f0f0f0 !important;
+                color: #000 !important;
+                font-size: 9pt;
+                padding: 2pt 6pt;
+            }
             
-            # Executar requisições para todos os endpoints
-            endpoint_responses = []
-            for endpoint in endpoints:
-                endpoint_name = endpoint.get('name', f'Endpoint {len(endpoint_responses) + 1}')
-                
-                # Preparar configuração do teste
-                test_config = {
-                    'name': endpoint_name,
-                    'request': endpoint['request'],
-                    'local_uuid': local_uuid,
-                }
-                
-                # Usar base_url específica se fornecida
-                if 'base_url' in endpoint:
-                    original_base_url = self.base_url
-                    self.base_url = endpoint['base_url']
-                
-                try:
-                    response = self._execute_request(test_config)
-                    
-                    # Capturar base_url usada
-                    used_base_url = endpoint.get('base_url', self.base_url)
-                    
-                    response_data = {
-                        'name': endpoint_name,
-                        'status_code': response.status_code,
-                        'headers': dict(response.headers),
-                        'body': None,
-                        'raw_response': response,
-                        'request_details': {
-                            'base_url': used_base_url,
-                            'method': endpoint['request']['method'].upper(),
-                            'path': endpoint['request'].get('path', '/'),
-                            'full_url': response.request.url,
-                            'headers': dict(response.request.headers),
-                            'query_params': dict(response.request.query_params) if hasattr(response.request, 'query_params') else {},
-                            'body': None
-                        }
-                    }
-                    
-                    # Capturar body da requisição
-                    if response.request.body:
-                        try:
-                            if isinstance(response.request.body, bytes):
-                                body_text = response.request.body.decode('utf-8')
-                                try:
-                                    response_data['request_details']['body'] = json.loads(body_text)
-                                except json.JSONDecodeError:
-                                    response_data['request_details']['body'] = body_text
-                            else:
-                                response_data['request_details']['body'] = response.request.body
-                        except Exception:
-                            response_data['request_details']['body'] = str(response.request.body)
-                    
-                    # Adicionar query params se existirem no endpoint
-                    if 'query_params' in endpoint['request']:
-                        response_data['request_details']['configured_params'] = self._replace_variables(endpoint['request']['query_params'], local_uuid)
-                    
-                    # Tentar parsear JSON da resposta
-                    try:
-                        response_data['body'] = response.json()
-                    except json.JSONDecodeError:
-                        response_data['body'] = response.text
-                    
-                    endpoint_responses.append(response_data)
-                    
-                finally:
-                    # Restaurar base_url original se foi alterada
-                    if 'base_url' in endpoint:
-                        self.base_url = original_base_url
+            .status-2xx {
+                border-style: solid;
+            }
             
-            result.endpoints_results = endpoint_responses
+            .status-4xx, .status-5xx {
+                border-style: dashed;
+                font-weight: bold;
+            }
             
-            # Comparar respostas
-            validation = comparison.get('validation', {})
-            result.comparison_details['ignored_fields'] = validation.get('ignore_fields', [])
+            /* Payloads e diffs */
+            .payload {
+                border: 1pt solid #666;
+                background-color: #fafafa !important;
+                font-size: 7pt;
+                line-height: 1.2;
+                padding: 4pt;
+                max-height: none;
+                overflow: visible;
+                page-break-inside: auto;
+            }
             
-            # Comparar status codes
-            if validation.get('compare_status', True):
-                status_codes = [r['status_code'] for r in endpoint_responses]
-                result.comparison_details['status_match'] = all(s == status_codes[0] for s in status_codes)
-            else:
-                result.comparison_details['status_match'] = True
+            /* Cores de diff em tons de cinza */
+            .d-r {
+                background-color: #f0f0f0 !important;
+                border-left: 3pt solid #666 !important;
+                color: #000 !important;
+                text-decoration: line-through;
+            }
             
-            # Comparar bodies
-            if validation.get('compare_body', True):
-                bodies = [r['body'] for r in endpoint_responses]
-                
-                # Se todos são JSON, usar DeepDiff
-                if all(isinstance(b, dict) or isinstance(b, list) for b in bodies):
-                    # Comparar o primeiro com todos os outros
-                    all_match = True
-                    differences = []
-                    
-                    for i in range(1, len(bodies)):
-                        diff = DeepDiff(
-                            bodies[0], 
-                            bodies[i],
-                            ignore_order=True,
-                            exclude_paths=result.comparison_details['ignored_fields']
-                        )
-                        
-                        if diff:
-                            all_match = False
-                            differences.append({
-                                'endpoint1': endpoint_responses[0]['name'],
-                                'endpoint2': endpoint_responses[i]['name'],
-                                'diff': diff.to_dict()
-                            })
-                    
-                    result.comparison_details['body_match'] = all_match
-                    result.comparison_details['differences'] = differences
-                else:
-                    # Comparação simples de strings
-                    result.comparison_details['body_match'] = all(b == bodies[0] for b in bodies)
-                    if not result.comparison_details['body_match']:
-                        result.comparison_details['differences'] = "Conteúdo diferente (não-JSON)"
-            else:
-                result.comparison_details['body_match'] = True
+            .d-a {
+                background-color: #e8e8e8 !important;
+                border-left: 3pt solid #333 !important;
+                color: #000 !important;
+                font-weight: bold;
+            }
             
-            # Determinar sucesso geral
-            result.success = (
-                result.comparison_details['status_match'] and 
-                result.comparison_details['body_match']
-            )
+            .d-m {
+                background-color: #f5f5f5 !important;
+                border-left: 3pt dotted #666 !important;
+                color: #000 !important;
+            }
             
-        except Exception as e:
-            result.success = False
-            result.error_message = f"Erro durante comparação: {str(e)}"
-        
-        return result
-    
-    def run_tests(self):
-        """Executa todos os testes configurados"""
-        tests = self.config.get('tests', [])
-        comparisons = self.config.get('comparisons', [])
-        report_config = self.config.get('report', {})
-        verbose = report_config.get('verbose', True)
-        stop_on_failure = report_config.get('stop_on_failure', False)
-        
-        # Executar testes normais
-        if tests:
-            print(f"\n{'='*60}")
-            print(f"Executando {len([t for t in tests if t.get('enabled', True)])} testes de API")
-            print(f"Base URL: {self.base_url}")
-            print(f"{'='*60}\n")
+            .d-u {
+                color: #333 !important;
+            }
             
-            for test in tests:
-                if not test.get('enabled', True):
-                    print(f"⏭️  {test['name']} - DESABILITADO")
-                    continue
-                
-                if verbose:
-                    print(f"🧪 Executando: {test['name']}")
-                    print(f"   Descrição: {test.get('description', 'N/A')}")
-                    print(f"   Método: {test['request']['method']} {test['request']['path']}")
-                
-                result = self._execute_test(test)
-                self.results.append(result)
-                
-                if result.success:
-                    print(f"✅ {test['name']} - SUCESSO ({result.execution_time:.2f}s)")
-                else:
-                    print(f"❌ {test['name']} - FALHA (Status: {result.status_code})")
-                    if verbose and result.error_message:
-                        print(f"   Erro: {result.error_message}")
-                
-                # Mostrar detalhes da validação se verbose
-                if verbose and result.validation_details:
-                    if result.validation_details.get('validations_passed'):
-                        for validation in result.validation_details['validations_passed']:
-                            print(f"   ✅ {validation}")
-                    if result.validation_details.get('validations_failed'):
-                        for validation in result.validation_details['validations_failed']:
-                            print(f"   ❌ {validation}")
-                
-                if verbose and result.request_details:
-                    print(f"   URL: {result.request_details.get('url', 'N/A')}")
-                
-                # Mostrar response se configurado
-                if report_config.get('show_response_in_console', False):
-                    self._show_response_in_console(result, report_config)
-                
-                if stop_on_failure and not result.success:
-                    print("\n⚠️  Parando execução devido a falha (stop_on_failure=true)")
-                    break
-        
-        # Executar comparações
-        if comparisons:
-            print(f"\n{'='*60}")
-            print(f"Executando {len([c for c in comparisons if c.get('enabled', True)])} comparações entre endpoints")
-            print(f"{'='*60}\n")
+            .char-removed {
+                background-color: #d0d0d0 !important;
+                text-decoration: line-through !important;
+            }
             
-            for comparison in comparisons:
-                if not comparison.get('enabled', True):
-                    print(f"⏭️  {comparison['name']} - DESABILITADO")
-                    continue
-                
-                result = self._execute_comparison(comparison)
-                self.comparison_results.append(result)
-                
-                if result.success:
-                    print(f"✅ {comparison['name']} - ENDPOINTS IDÊNTICOS")
-                else:
-                    print(f"❌ {comparison['name']} - ENDPOINTS DIFERENTES")
-                    if result.error_message:
-                        print(f"   Erro: {result.error_message}")
-                    else:
-                        if not result.comparison_details['status_match']:
-                            print(f"   ❌ Status codes diferentes")
-                        if not result.comparison_details['body_match']:
-                            print(f"   ❌ Conteúdo dos bodies diferentes")
-        
-        self._generate_report()
-    
-    def _show_response_in_console(self, result: TestResult, report_config: Dict[str, Any]):
-        """Mostra o response no console de acordo com as configurações"""
-        if not result.response_data:
-            return
-        
-        format_json = report_config.get('format_json_response', True)
-        max_length = report_config.get('max_response_display_length', 1000)
-        
-        print(f"   📄 Response (Status {result.status_code}):")
-        
-        try:
-            # Se response_data é um dict (JSON), formatá-lo
-            if isinstance(result.response_data, dict) and format_json:
-                response_text = json.dumps(self._make_serializable(result.response_data), indent=2, ensure_ascii=False)
-            else:
-                response_text = str(result.response_data)
+            .char-added {
+                background-color: #c0c0c0 !important;
+                font-weight: bold !important;
+            }
             
-            # Limitar tamanho se configurado
-            if max_length > 0 and len(response_text) > max_length:
-                response_text = response_text[:max_length] + "... [truncado]"
+            .char-modified {
+                background-color: #e0e0e0 !important;
+                font-weight: bold !important;
+            }
             
-            # Indentar todas as linhas para ficar alinhado
-            lines = response_text.split('\n')
-            for line in lines:
-                print(f"      {line}")
-                
-        except Exception as e:
-            print(f"      Erro ao formatar response: {e}")
-        
-        print()  # Linha em branco
-
-    def _make_serializable(self, obj):
-        if isinstance(obj, SetOrdered):
-            return list(obj)
-        elif isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return [self._make_serializable(item) for item in obj]
-        return obj
-
-    def _generate_report(self):
-        """Gera relatório dos testes"""
-        report_config = self.config.get('report', {})
-        
-        total_tests = len(self.results)
-        successful_tests = sum(1 for r in self.results if r.success)
-        failed_tests = total_tests - successful_tests
-        
-        print(f"\n{'='*60}")
-        print("RESUMO DOS TESTES")
-        print(f"{'='*60}")
-        print(f"Total de testes: {total_tests}")
-        print(f"✅ Sucessos: {successful_tests}")
-        print(f"❌ Falhas: {failed_tests}")
-        if total_tests > 0:
-            print(f"Taxa de sucesso: {(successful_tests/total_tests*100):.1f}%")
-        
-        if failed_tests > 0:
-            print("\nTestes que falharam:")
-            for result in self.results:
-                if not result.success:
-                    print(f"  - {result.test_name}: {result.error_message or f'Status {result.status_code}'}")
-        
-        # Resumo das comparações
-        if self.comparison_results:
-            total_comparisons = len(self.comparison_results)
-            successful_comparisons = sum(1 for c in self.comparison_results if c.success)
-            failed_comparisons = total_comparisons - successful_comparisons
+            /* Request details */
+            .request-details {
+                background-color: #f8f8f8 !important;
+                border: 1pt solid #666;
+                font-size: 6pt;
+                padding: 3pt;
+                margin-bottom: 4pt;
+                page-break-inside: avoid;
+            }
             
-            print(f"\n{'='*60}")
-            print("RESUMO DAS COMPARAÇÕES")
-            print(f"{'='*60}")
-            print(f"Total de comparações: {total_comparisons}")
-            print(f"✅ Idênticas: {successful_comparisons}")
-            print(f"❌ Diferentes: {failed_comparisons}")
+            .request-details code {
+                background-color: #e8e8e8 !important;
+                font-size: 6pt;
+                padding: 0.5pt 1pt;
+            }
             
-            if failed_comparisons > 0:
-                print("\nComparações com diferenças:")
-                for result in self.comparison_results:
-                    if not result.success:
-                        print(f"  - {result.comparison_name}")
-        
-        # Salvar resultados se configurado
-        if report_config.get('save_results', True):
-            output_file = report_config.get('output_file', 'test_results.json')
-            self._save_results(output_file, report_config)
-            print(f"\n📄 Resultados salvos em: {output_file}")
+            /* Banners de resultado */
+            .result-banner {
+                border: 2pt solid #333;
+                background-color: #f0f0f0 !important;
+                color: #000 !important;
+                font-size: 11pt;
+                font-weight: bold;
+                padding: 8pt;
+                margin: 10pt 0;
+                page-break-inside: avoid;
+                page-break-after: avoid;
+            }
             
-            # Gerar relatório HTML de comparações se houver comparações
-            if self.comparison_results:
-                html_file = report_config.get('comparison_report', 'comparison_report.html')
-                try:
-                    self._generate_html_comparison_report_simple(html_file)
-
-                    webbrowser.open(os.path.abspath(html_file))
-                except Exception as e:
-                    print(f"Erro ao gerar HTML: {e}")
-                print(f"📄 Relatório HTML de comparações salvo em: {html_file}")
-    
-    def _save_results(self, filename: str, report_config: Dict[str, Any]):
-        """Salva os resultados em arquivo JSON"""
-        include_request = report_config.get('include_request_details', True)
-        include_response = report_config.get('include_response_details', True)
-        
-        results_data = {
-            'timestamp': datetime.now().isoformat(),
-            'config': {
-                'base_url': self.base_url,
-                'timeout': self.timeout,
-                'config_file': self.config_file
-            },
-            'summary': {
-                'tests': {
-                    'total': len(self.results),
-                    'success': sum(1 for r in self.results if r.success),
-                    'failed': sum(1 for r in self.results if not r.success)
-                },
-                'comparisons': {
-                    'total': len(self.comparison_results),
-                    'identical': sum(1 for c in self.comparison_results if c.success),
-                    'different': sum(1 for c in self.comparison_results if not c.success)
-                }
-            },
-            'results': [],
-            'comparisons': []
-        }
-        
-        for result in self.results:
-            test_result = {
-                'test_name': result.test_name,
-                'success': result.success,
-                'status_code': result.status_code,
-                'execution_time': result.execution_time,
-                'timestamp': result.timestamp,
-                'error_message': result.error_message,
-                'validation_details': result.validation_details
+            .result-success {
+                border-style: solid;
             }
             
-            if include_request:
-                test_result['request'] = result.request_details
+            .result-failure {
+                border-style: double;
+                background-color: #e0e0e0 !important;
+            }
             
-            if include_response:
-                test_result['response'] = result.response_details
+            /* Legenda */
+            .legend {
+                border: 1pt solid #666;
+                padding: 8pt;
+                margin-bottom: 15pt;
+                page-break-inside: avoid;
+                background-color: #fafafa;
+                font-size: 9pt;
+            }
             
-            results_data['results'].append(test_result)
-        
-        # Adicionar resultados das comparações
-        for comparison in self.comparison_results:
-            comparison_result = {
-                'comparison_name': comparison.comparison_name,
-                'success': comparison.success,
-                'timestamp': comparison.timestamp,
-                'error_message': comparison.error_message,
-                'comparison_details': comparison.comparison_details,
-                'endpoints_results': []
+            .legend-item {
+                margin-right: 15pt;
             }
             
-            # Incluir detalhes de cada endpoint (sem o raw_response)
-            for endpoint in comparison.endpoints_results:
-                endpoint_data = {
-                    'name': endpoint['name'],
-                    'status_code': endpoint['status_code'],
-                    'headers': endpoint['headers'],
-                    'body': endpoint['body']
-                }
-                comparison_result['endpoints_results'].append(endpoint_data)
+            .legend-color {
+                border: 1pt solid #333 !important;
+                width: 12pt;
+                height: 12pt;
+                display: inline-block;
+                vertical-align: middle;
+            }
             
-            results_data['comparisons'].append(comparison_result)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self._make_serializable(results_data), f, indent=2, ensure_ascii=False)
-    
-    def _generate_html_comparison_report_simple(self, filename: str):
-        """Gera relatório HTML com diferenças visuais detalhadas entre endpoints"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('''<!DOCTYPE html>
-<html>
+            /* Remover elementos desnecessários na impressão */
+            .legend-color:nth-child(1) {
+                background-color: #f0f0f0 !important;
+            }
+            
+            .legend-color:nth-child(2) {
+                background-color: #e0e0e0 !important;
+            }
+            
+            .legend-color:nth-child(3) {
+                background-color: #d0d0d0 !important;
+            }
+            
+            /* Garantir que o texto seja sempre legível */
+            * {
+                color-adjust: exact;
+                -webkit-print-color-adjust: exact;
+                print-color-adjust: exact;
+            }
+            
+            /* Evitar quebras ruins em elementos importantes */
+            h1, h2, h3, .result-banner, .legend {
+                page-break-after: avoid;
+            }
+            
+            /* Forçar nova página antes de cada comparação principal */
+            h2:not(:first-of-type) {
+                page-break-before: auto;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="main-container">'''.encode('utf-8')
+
+# Legenda de cores do relatório HTML de comparações
+_HTML_LEGEND = '''<div class="legend">
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: #ffeaea; border: 1px solid #f56565;"></div>
+                    <span>Removido</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: #f0fff4; border: 1px solid #48bb78;"></div>
+                    <span>Adicionado</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: #fff8dc; border: 1px solid #ed8936;"></div>
+                    <span>Modificado</span>
+                </div>
+            </div>'''.encode('utf-8')
+
+# Cabeçalho (CSS) do relatório HTML detalhado de _generate_html_comparison_report
+_HTML_DETAILED_HEADER = """
+<!DOCTYPE html>
+<html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Comparação de Endpoints</title>
+    <title>Relatório de Comparação de Endpoints</title>
     <style>
-        * {
-            box-sizing: border-box;
-        }
         body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             margin: 0;
-            padding: 1rem;
-            background-color: #f8f9fa;
-            line-height: 1.6;
+            padding: 20px;
+            background-color: #f5f5f5;
+            color: #333;
         }
-        .main-container {
-            max-width: 1400px;
+        .container {
+            max-width: 1200px;
             margin: 0 auto;
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
         }
-        h1 {
+        h1, h2, h3 {
             color: #2c3e50;
-            text-align: center;
-            margin-bottom: 1.5rem;
-            font-size: clamp(1.5rem, 4vw, 2.5rem);
         }
-        h2 {
-            color: #34495e;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 0.625rem;
-            margin-top: 2.5rem;
-            font-size: clamp(1.25rem, 3vw, 1.75rem);
+        .summary {
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 5px;
+            margin-bottom: 30px;
         }
-        h3 {
-            margin-top: 0;
-            font-weight: bold;
-            font-size: clamp(1rem, 2.5vw, 1.25rem);
+        .comparison {
+            margin-bottom: 40px;
+            border: 1px solid #e0e0e0;
+            border-radius: 5px;
+            overflow: hidden;
         }
-        .comparison-container {
+        .comparison-header {
+            background-color: #f8f9fa;
+            padding: 15px;
+            border-bottom: 1px solid #e0e0e0;
+        }
+        .comparison-header.success {
+            background-color: #d4edda;
+            border-color: #c3e6cb;
+        }
+        .comparison-header.failure {
+            background-color: #f8d7da;
+            border-color: #f5c6cb;
+        }
+        .endpoints {
             display: flex;
-            gap: 1.25rem;
-            margin-bottom: 2rem;
-            flex-wrap: wrap;
+            gap: 20px;
+            padding: 20px;
         }
-        .endpoint-container {
+        .endpoint {
             flex: 1;
-            min-width: 300px;
-            border-radius: 8px;
-            padding: 1rem;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            background-color: white;
-            border: 2px solid #e0e0e0;
+            background-color: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
         }
-        .status-badge {
+        .endpoint h4 {
+            margin-top: 0;
+            color: #495057;
+        }
+        .status-code {
             display: inline-block;
-            padding: 4px 12px;
-            border-radius: 20px;
+            padding: 3px 8px;
+            border-radius: 3px;
             font-weight: bold;
             font-size: 14px;
-            margin-bottom: 10px;
         }
         .status-2xx { background-color: #d4edda; color: #155724; }
+        .status-3xx { background-color: #fff3cd; color: #856404; }
         .status-4xx { background-color: #f8d7da; color: #721c24; }
         .status-5xx { background-color: #f8d7da; color: #721c24; }
-        .payload {
-            border-radius: 6px;
-            padding: 1rem;
-            overflow: auto;
-            max-height: 400px;
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 0.8125rem;
-            line-height: 1.6;
-            white-space: pre;
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            word-break: break-word;
-            overflow-wrap: break-word;
-        }
-        .diff-line {
-            margin: 0;
-            padding: 2px 5px;
-            border-left: 3px solid transparent;
-        }
-        .diff-removed {
-            background-color: #ffeaea;
-            border-left-color: #f56565;
-            color: #c53030;
-        }
-        .diff-added {
-            background-color: #f0fff4;
-            border-left-color: #48bb78;
-            color: #2d7d32;
-        }
-        .diff-modified {
-            background-color: #fff8dc;
-            border-left-color: #ed8936;
-            color: #c05621;
-        }
-        .diff-unchanged {
-            color: #718096;
-        }
-        .char-removed {
-            background-color: #fed7d7;
-            text-decoration: line-through;
-        }
-        .char-added {
-            background-color: #c6f6d5;
-            font-weight: bold;
-        }
-        .char-modified {
-            background-color: #faf089;
-            font-weight: bold;
-        }
         .differences {
-            background-color: #fff5f5;
-            border: 1px solid #fed7d7;
-            border-radius: 8px;
+            margin: 20px;
             padding: 20px;
-            margin-top: 20px;
-        }
-        .differences h3 {
-            color: #c53030;
-            margin-top: 0;
+            background-color: #fff5f5;
+            border: 1px solid #ffdddd;
+            border-radius: 5px;
         }
-        .legend {
-            display: flex;
-            gap: 20px;
-            margin-bottom: 20px;
-            font-size: 12px;
+        .diff-item {
+            margin-bottom: 15px;
+            padding: 10px;
+            background-color: white;
+            border: 1px solid #e0e0e0;
+            border-radius: 3px;
         }
-        .legend-item {
-            display: flex;
-            align-items: center;
-            gap: 5px;
+        .diff-type {
+            font-weight: bold;
+            color: #d73a49;
+            margin-bottom: 5px;
         }
-        .legend-color {
-            width: 15px;
-            height: 15px;
+        .diff-detail {
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 13px;
+            background-color: #f6f8fa;
+            padding: 8px;
             border-radius: 3px;
+            overflow-x: auto;
         }
-        .result-banner {
-            text-align: center;
+        .json-content {
+            background-color: #f6f8fa;
             padding: 15px;
-            margin: 20px 0;
-            border-radius: 8px;
-            font-size: 18px;
-            font-weight: bold;
-        }
-        .result-success {
-            background-color: #d4edda;
-            color: #155724;
-            border: 2px solid #c3e6cb;
+            border-radius: 5px;
+            overflow-x: auto;
+            max-height: 400px;
+            overflow-y: auto;
         }
-        .result-failure {
-            background-color: #f8d7da;
-            color: #721c24;
-            border: 2px solid #f5c6cb;
+        pre {
+            margin: 0;
+            white-space: pre-wrap;
+            word-wrap: break-word;
         }
-        
-        /* Request details box */
-        .request-details {
-            background-color: #f0f8ff;
-            border: 1px solid #cce7ff;
-            border-radius: 4px;
-            padding: 0.625rem;
-            margin-bottom: 0.625rem;
-            font-size: 0.75rem;
-            overflow-x: auto;
+        .timestamp {
+            color: #6c757d;
+            font-size: 14px;
         }
-        .request-details code {
-            background-color: #e9ecef;
-            padding: 0.125rem 0.25rem;
+        .badge {
+            display: inline-block;
+            padding: 4px 8px;
+            font-size: 12px;
+            font-weight: bold;
             border-radius: 3px;
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 0.85em;
-            color: #495057;
+            text-transform: uppercase;
         }
-        
-        /* Responsive design */
-        @media screen and (max-width: 1024px) {
-            .comparison-container {
-                gap: 1rem;
-            }
-            .endpoint-container {
-                min-width: 280px;
-            }
+        .badge-success { background-color: #28a745; color: white; }
+        .badge-danger { background-color: #dc3545; color: white; }
+    </style>
+</head>
+<body>
+    <div class="container">
+""".encode('utf-8')
+
+
+class TestResult:
+    """Resultado de um teste individual"""
+    __slots__ = (
+        'test_name', 'success', 'status_code', 'response_data', 'response_headers', 'error_message',
+        'execution_time', 'timestamp', 'request_details', 'validation_details'
+    )
+    
+    def __init__(self, test_name: str):
+        self.test_name = test_name
+        self.success = False
+        self.status_code = None
+        self.response_data = None
+        self.response_headers = None
+        self.error_message = None
+        self.execution_time = 0.0
+        self.timestamp = datetime.now().isoformat()
+        self.request_details = {}
+        self.validation_details = {}
+
+
+class ComparisonResult:
+    """Resultado de uma comparação entre endpoints"""
+    __slots__ = ('comparison_name', 'success', 'timestamp', 'endpoints_results', 'comparison_details', 'error_message')
+    
+    def __init__(self, comparison_name: str):
+        self.comparison_name = comparison_name
+        self.success = False
+        self.timestamp = datetime.now().isoformat()
+        self.endpoints_results = []
+        self.comparison_details = {
+            'status_match': False,
+            'body_match': False,
+            'differences': None,
+            'ignored_fields': []
         }
+        self.error_message = None
+
+
+class APIComparator:
+    """API Comparator - Compare and validate API endpoints with visual diff reporting"""
+    
+    def __init__(self, config_file: str = "api_comparator_config.yaml"):
+        self.config_file = config_file
+        self.config = self._load_config()
+        self.results: List[TestResult] = []
+        self.comparison_results: List[ComparisonResult] = []
+        self.session = requests.Session()
+        self.variables = {}
+        self._setup_session()
         
-        @media screen and (max-width: 768px) {
-            body {
-                padding: 0.5rem;
-            }
-            h1 {
-                margin-bottom: 1rem;
-            }
-            h2 {
-                margin-top: 1.5rem;
-                font-size: 1.5rem;
-            }
-            h3 {
-                font-size: 1.125rem;
-            }
-            .comparison-container {
-                flex-direction: column;
-                gap: 1rem;
-            }
-            .endpoint-container {
-                min-width: unset;
-                width: 100%;
-            }
-            .payload {
-                max-height: 300px;
-                font-size: 0.75rem;
-                padding: 0.75rem;
-            }
-            .legend {
-                flex-wrap: wrap;
-                gap: 0.75rem;
-                font-size: 0.75rem;
-            }
-            .result-banner {
-                font-size: 1rem;
-                padding: 0.75rem;
-            }
-            .request-details {
-                font-size: 0.6875rem;
-                padding: 0.5rem;
-            }
-        }
+        # Cache das substituições de strings determinísticas (sem UUID aleatório)
+        self._replace_str = lru_cache(maxsize=4096)(self._substitute_placeholders)
         
-        @media screen and (max-width: 480px) {
-            h1 {
-                font-size: 1.5rem;
-            }
-            h2 {
-                font-size: 1.25rem;
-            }
-            h3 {
-                font-size: 1rem;
-            }
-            .endpoint-container {
-                padding: 0.75rem;
-            }
-            .status-badge {
-                font-size: 0.75rem;
-                padding: 3px 8px;
-            }
-            .payload {
-                font-size: 0.6875rem;
-                padding: 0.5rem;
-            }
+        # Requests com as variáveis estáticas já expandidas (apenas {{uuid}} muda por execução)
+        self._compiled_requests: Dict[int, tuple] = {}
+        self._compile_requests()
+        
+        # Pool de threads para executar requisições em paralelo (apenas se concurrency > 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else None
+    
+    def _load_config(self) -> Dict[str, Any]:
+        """Carrega a configuração do arquivo YAML"""
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                return yaml.load(f, Loader=_YAML_LOADER)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {self.config_file} não encontrado!")
+            sys.exit(1)
+        except yaml.YAMLError as e:
+            print(f"Erro ao ler YAML: {e}")
+            sys.exit(1)
+    
+    def _setup_session(self):
+        """Configura a sessão HTTP com headers globais"""
+        config = self.config.get('config', {})
+        
+        # Headers globais
+        global_headers = config.get('headers', {})
+        self.session.headers.update(global_headers)
+        
+        # Variáveis globais
+        self.variables = config.get('variables', {})
+        
+        # Base URLs
+        self.base_url = config.get('base_url', 'http://localhost:8080')
+        self.base_url_comparison = config.get('base_url_comparison', None)
+        self.timeout = config.get('timeout', 30)
+        
+        # Número máximo de requisições simultâneas (1 = execução sequencial)
+        self.concurrency = max(1, int(config.get('concurrency', 1)))
+        
+        # Detalhes que só precisam ser coletados se forem incluídos no relatório
+        report_config = self.config.get('report', {})
+        self._verbose = report_config.get('verbose', True)
+        self._include_request_details = report_config.get('include_request_details', True)
+        self._include_response_details = report_config.get('include_response_details', True)
+        
+        # Pool de conexões reutilizáveis (keep-alive) e retentativas opcionais para falhas de gateway
+        # (desligadas por padrão; o Retry-After do servidor é ignorado para não atrasar os testes)
+        retries = int(config.get('retries', 0))
+        retry = 0  # padrão do requests: erros (ex.: ReadTimeout) chegam sem embrulho de MaxRetryError
+        if retries > 0:
+            retry = Retry(
+                total=retries,
+                backoff_factor=0.1,
+                status_forcelist=[502, 503, 504],
+                respect_retry_after_header=False,
+                raise_on_status=False
+            )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(64, self.concurrency), max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def _replace_variables(self, text: Union[str, Dict, List], local_uuid = None) -> Union[str, Dict, List]:
+        """Substitui variáveis no formato {{variavel}} pelos valores"""
+        if isinstance(text, str):
+            if '{{' not in text:
+                return text
+            
+            # Sem local_uuid, cada {{uuid}} gera um valor novo e não pode ser cacheado
+            if local_uuid or '{{uuid}}' not in text:
+                return self._replace_str(text, local_uuid or None)
+            return self._substitute_placeholders(text)
+        
+        elif isinstance(text, dict):
+            return {k: self._replace_variables(v, local_uuid) for k, v in text.items()}
+        
+        elif isinstance(text, list):
+            return [self._replace_variables(item, local_uuid) for item in text]
+        
+        return text
+    
+    def _substitute_placeholders(self, text: str, local_uuid: str = None) -> str:
+        """Substitui os placeholders de uma única string"""
+        # Um único UUID por string quando não há local_uuid
+        generated_uuid = local_uuid
+        
+        def replace(match):
+            nonlocal generated_uuid
+            key = match.group(1)
+            # Substituir {{uuid}} por um novo UUID
+            if key == 'uuid':
+                if generated_uuid is None:
+                    generated_uuid = str(uuid.uuid4())
+                return generated_uuid
+            # Substituir outras variáveis, mantendo placeholders desconhecidos
+            if key in self.variables:
+                return str(self.variables[key])
+            return match.group(0)
+        
+        return _VARIABLE_RE.sub(replace, text)
+    
+    def _compile_requests(self):
+        """Pré-compila os requests de todos os testes e comparações configurados"""
+        request_configs = [test.get('request') for test in self.config.get('tests') or []]
+        for comparison in self.config.get('comparisons') or []:
+            request_configs.append(comparison.get('request'))
+            request_configs.extend(endpoint.get('request') for endpoint in comparison.get('endpoints') or [])
+        
+        for request_config in request_configs:
+            if isinstance(request_config, dict):
+                self._compile_request(request_config)
+    
+    def _compile_request(self, request_config: Dict[str, Any]) -> tuple:
+        """Expande as variáveis estáticas do request e registra onde ainda há {{uuid}}"""
+        # Substituir {{uuid}} por ele mesmo preserva o placeholder para cada execução
+        compiled = self._replace_variables(request_config, '{{uuid}}')
+        
+        uuid_slots = []
+        stack = [((), compiled)]
+        while stack:
+            path, value = stack.pop()
+            if isinstance(value, str):
+                if '{{uuid}}' in value:
+                    uuid_slots.append(path)
+            elif isinstance(value, dict):
+                stack.extend((path + (k,), v) for k, v in value.items())
+            elif isinstance(value, list):
+                stack.extend((path + (i,), v) for i, v in enumerate(value))
+        
+        # Content-Type efetivo (headers do teste sobrepõem os globais) define como o body é enviado
+        content_type = self.session.headers.get('Content-Type', '')
+        for key, value in (compiled.get('headers') or {}).items():
+            if key.lower() == 'content-type':
+                content_type = value or ''
+        json_body = content_type.lower() == 'application/json'
+        
+        # Guardar o request original mantém o id() válido enquanto o cache existir
+        entry = (request_config, compiled, uuid_slots, json_body)
+        self._compiled_requests[id(request_config)] = entry
+        return entry
+    
+    def _render_request(self, request_config: Dict[str, Any], local_uuid: str = None) -> tuple[Dict[str, Any], bool]:
+        """Retorna o request pronto para execução (preenchendo apenas os campos com {{uuid}}) e se o body é JSON"""
+        entry = self._compiled_requests.get(id(request_config))
+        if entry is None or entry[0] is not request_config:
+            entry = self._compile_request(request_config)
+        _, compiled, uuid_slots, json_body = entry
+        
+        if not uuid_slots:
+            return compiled, json_body
+        
+        # Copiar apenas os containers no caminho de cada campo com {{uuid}}
+        rendered = dict(compiled)
+        copied = {(): rendered}
+        for path in uuid_slots:
+            container = rendered
+            for depth in range(1, len(path)):
+                prefix = path[:depth]
+                if prefix not in copied:
+                    child = container[path[depth - 1]]
+                    copied[prefix] = dict(child) if isinstance(child, dict) else list(child)
+                    container[path[depth - 1]] = copied[prefix]
+                container = copied[prefix]
+            
+            # Um UUID novo por campo quando não há local_uuid
+            container[path[-1]] = container[path[-1]].replace('{{uuid}}', local_uuid or str(uuid.uuid4()))
+        
+        return rendered, json_body
+    
+    def _map(self, func, *iterables):
+        """Aplica func aos itens, em paralelo se houver pool de threads, preservando a ordem"""
+        if self._executor is None:
+            return map(func, *iterables)
+        return self._executor.map(func, *iterables)
+    
+    def _build_url(self, path: str, path_params: Dict[str, str] = None, base_url: str = None) -> str:
+        """Constrói a URL completa com parâmetros de caminho (base_url padrão: self.base_url)"""
+        # Substituir variáveis no path
+        path = self._replace_variables(path)
+        
+        # Substituir parâmetros de caminho
+        if path_params:
+            for key, value in path_params.items():
+                placeholder = f"{{{key}}}"
+                path = path.replace(placeholder, str(self._replace_variables(value)))
+        
+        # Construir URL completa
+        return urljoin(base_url or self.base_url, path)
+    
+    def _validate_response(self, response: requests.Response, expected: Dict[str, Any], response_json: Any = None,
+                           body_is_json: bool = False) -> tuple[bool, Dict[str, Any]]:
+        """Valida a resposta (com o body já interpretado) contra as expectativas e retorna detalhes da validação"""
+        validation_details = {
+            'validations_passed': [],
+            'validations_failed': [],
+            'overall_success': True
         }
         
-        /* Print styles */
-        @media print {
-            @page {
-                size: A4;
-                margin: 15mm;
-            }
+        if not expected:
+            validation_details['validations_passed'].append("Nenhuma validação configurada - teste aprovado")
+            return True, validation_details
+        
+        # Validar status code
+        if 'status_code' in expected:
+            expected_status = expected['status_code']
+            actual_status = response.status_code
+            if actual_status == expected_status:
+                validation_details['validations_passed'].append(f"Status code: {actual_status} (esperado: {expected_status})")
+            else:
+                validation_details['validations_failed'].append(f"Status code: {actual_status} (esperado: {expected_status})")
+                validation_details['overall_success'] = False
+        
+        # Validar headers
+        if 'headers' in expected:
+            for header, expected_value in expected['headers'].items():
+                actual_value = response.headers.get(header, '')
+                if expected_value.lower() in actual_value.lower():
+                    validation_details['validations_passed'].append(f"Header '{header}': contém '{expected_value}'")
+                else:
+                    validation_details['validations_failed'].append(f"Header '{header}': '{actual_value}' não contém '{expected_value}'")
+                    validation_details['overall_success'] = False
+        
+        # Validar corpo da resposta
+        if 'body' in expected:
+            if not body_is_json:
+                validation_details['validations_failed'].append("Erro: esperava JSON mas a resposta não é um JSON válido")
+                validation_details['overall_success'] = False
+            else:
+                # Verificar se contém campos específicos
+                if 'contains' in expected['body']:
+                    # Representação textual calculada uma única vez para todos os campos
+                    haystack = str(response_json)
+                    for field in expected['body']['contains']:
+                        if str(field) in haystack:
+                            validation_details['validations_passed'].append(f"Body contém: '{field}'")
+                        else:
+                            validation_details['validations_failed'].append(f"Body não contém: '{field}'")
+                            validation_details['overall_success'] = False
+                
+                # Verificar valores exatos
+                if 'exact' in expected['body']:
+                    for key, expected_value in expected['body']['exact'].items():
+                        actual_value = response_json.get(key)
+                        if actual_value == expected_value:
+                            validation_details['validations_passed'].append(f"Body['{key}']: {actual_value} (esperado: {expected_value})")
+                        else:
+                            validation_details['validations_failed'].append(f"Body['{key}']: {actual_value} (esperado: {expected_value})")
+                            validation_details['overall_success'] = False
+        
+        return validation_details['overall_success'], validation_details
+    
+    def _execute_request(self, test_config: Dict[str, Any], stream: bool = False,
+                         base_url: str = None) -> tuple[requests.Response, Any]:
+        """Executa a requisição HTTP e retorna a resposta junto com o body enviado"""
+        local_uuid =  test_config['local_uuid'] if 'local_uuid' in test_config else None
+        request_config, json_content_type = self._render_request(test_config['request'], local_uuid)
+        
+        # Preparar componentes da requisição
+        method = request_config['method'].upper()
+        # verifica se há comparison_path caso haja substitui usa na requisicao
+        # caso não usao path
+        if request_config.get("comparison_path",False):
+            path = request_config.get("comparison_path","/")
+        else:
+            path = request_config.get('path', '/')
+
+        path_params = request_config.get('path_params', {})
+        
+        # Construir URL
+        url = self._build_url(path, path_params, base_url)
+        
+        # Headers específicos do teste (a sessão mescla os headers globais ao enviar)
+        headers = request_config.get('headers')
+        
+        # Query parameters
+        params = request_config.get('query_params', {})
+        
+        # Body da requisição
+        json_body = None
+        data = None
+        if 'body' in request_config:
+            body = request_config['body']
+            if json_content_type:
+                json_body = body
+            else:
+                data = body
+        
+        # Executar requisição
+        response = self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json_body,
+            data=data,
+            timeout=self.timeout,
+            stream=stream
+        )
+        
+        return response, json_body if json_body is not None else data
+    
+    def _parse_response_body(self, response: requests.Response) -> tuple[Any, bool, bool]:
+        """Interpreta o body da resposta como JSON ou, se não for JSON, retorna o texto (e se é JSON e se veio do orjson)"""
+        # Inteiros longos só ficam exatos no parser padrão
+        if not _LONG_INT_RE.search(response.content):
+            try:
+                return orjson.loads(response.content), True, True
+            except orjson.JSONDecodeError:
+                pass
+        
+        # Fallback para inteiros longos e respostas que o orjson não aceita (BOM, outros encodings, NaN)
+        try:
+            return response.json(), True, False
+        except json.JSONDecodeError:
+            return response.text, False, False
+    
+    def _execute_test(self, test: Dict[str, Any]) -> TestResult:
+        """Executa um teste individual"""
+        result = TestResult(test['name'])
+        
+        try:
+            expected = test.get('expected', {})
             
-            body {
-                background-color: white;
-                color: #000;
-                font-size: 10pt;
-                line-height: 1.4;
-                padding: 0;
-                margin: 0;
-            }
+            # Downloads sem validação de body são gravados em blocos, sem carregar o conteúdo em memória
+            stream_to_file = bool(expected.get('save_response_to')) and 'body' not in expected
             
-            .main-container {
-                max-width: 100%;
-                margin: 0;
-            }
+            # Executar requisição
+            start_time = time.perf_counter()
+            response, request_body = self._execute_request(test, stream=stream_to_file)
+            if stream_to_file:
+                # Arquivo aberto só no primeiro bloco com conteúdo: resposta vazia não grava nada
+                f = None
+                try:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if not chunk:
+                            continue
+                        if f is None:
+                            f = open(expected['save_response_to'], 'wb')
+                        f.write(chunk)
+                finally:
+                    if f is not None:
+                        f.close()
             
-            h1 {
-                font-size: 20pt;
-                margin-bottom: 10pt;
-                page-break-after: avoid;
-            }
+            result.execution_time = time.perf_counter() - start_time
+            result.status_code = response.status_code
+            if self._include_response_details:
+                result.response_headers = dict(response.headers)
             
-            h2 {
-                font-size: 14pt;
-                margin-top: 15pt;
-                margin-bottom: 10pt;
-                page-break-after: avoid;
-                page-break-inside: avoid;
-                border-bottom: 1pt solid #333;
+            # Armazenar detalhes da requisição
+            result.request_details = {
+                'method': test['request']['method'],
+                'url': response.request.url,
+                'headers': dict(response.request.headers) if self._include_request_details else None,
+                'body': request_body
             }
             
-            h3 {
-                font-size: 12pt;
-                margin-top: 10pt;
-                margin-bottom: 5pt;
-                page-break-after: avoid;
-            }
+            # Tentar parsear resposta como JSON (o conteúdo transmitido já está no arquivo)
+            is_json = False
+            if not stream_to_file:
+                result.response_data, is_json, _ = self._parse_response_body(response)
             
-            /* Evitar quebras de página ruins */
-            .comparison-container {
-                page-break-inside: avoid;
-                display: flex !important;
-                gap: 10pt;
-                margin-bottom: 15pt;
-            }
+            # Validar resposta
+            result.success, result.validation_details = self._validate_response(response, expected, result.response_data, is_json)
             
-            .endpoint-container {
-                box-shadow: none;
-                border: 1pt solid #333;
-                padding: 8pt;
-                margin-bottom: 0;
-                page-break-inside: avoid;
-                background-color: white;
-                min-width: auto;
-                width: 48%;
-                flex: 1;
-            }
+            # Salvar arquivo se configurado
+            if not stream_to_file and expected.get('save_response_to') and response.content:
+                with open(expected['save_response_to'], 'wb') as f:
+                    f.write(response.content)
             
-            /* Status badges em preto e branco */
-            .status-badge {
-                border: 1pt solid #333;
-                background-color: #f0f0f0 !important;
-                color: #000 !important;
-                font-size: 9pt;
-                padding: 2pt 6pt;
-            }
+        except requests.exceptions.RequestException as e:
+            result.success = False
+            result.error_message = f"Erro na requisição: {str(e)}"
+        except Exception as e:
+            result.success = False
+            result.error_message = f"Erro: {str(e)}"
+        
+        return result
+    
+    def _execute_comparison(self, comparison: Dict[str, Any]) -> ComparisonResult:
+        """Executa uma comparação entre endpoints"""
+        result = ComparisonResult(comparison['name'])
+        
+        try:
+            # Se há apenas um request e duas base_urls configuradas, usar ambas
+            local_uuid : str = str(uuid.uuid4())
+            if 'request' in comparison and self.base_url_comparison:
+                endpoints = [
+                    {
+                        'name': 'Host 1',
+                        'request': comparison['request'],
+                        'base_url': self.base_url,
+                    },
+                    {
+                        'name': 'Host 2', 
+                        'request': comparison['request'],
+                        'base_url': self.base_url_comparison,
+                    }
+                ]
+            else:
+                endpoints = comparison.get('endpoints', [])
             
-            .status-2xx {
-                border-style: solid;
-            }
+            if len(endpoints) < 2:
+                result.error_message = "Comparação requer pelo menos 2 endpoints ou configuração base_url_comparison"
+                return result
             
-            .status-4xx, .status-5xx {
-                border-style: dashed;
-                font-weight: bold;
-            }
+            # Executar requisições para todos os endpoints (em paralelo quando concurrency > 1)
+            endpoint_names = [endpoint.get('name', f'Endpoint {i + 1}') for i, endpoint in enumerate(endpoints)]
+            endpoint_responses = list(self._map(
+                partial(self._execute_endpoint, local_uuid=local_uuid),
+                endpoints,
+                endpoint_names
+            ))
+            
+            # Respostas byte a byte iguais (e com o mesmo encoding) passam a compartilhar o mesmo body parseado
+            first_by_raw = {}
+            # Bodies do parser padrão (NaN, Infinity, inteiros longos) não têm forma canônica confiável:
+            # o orjson grava NaN/Infinity como null
+            inexact_bodies = set()
+            for endpoint_response in endpoint_responses:
+                shared = first_by_raw.setdefault(endpoint_response.pop('body_raw'), endpoint_response)
+                if shared is not endpoint_response:
+                    endpoint_response['body'] = shared['body']
+                if not endpoint_response.pop('body_via_orjson'):
+                    inexact_bodies.add(id(endpoint_response['body']))
             
-            /* Payloads e diffs */
-            .payload {
-                border: 1pt solid #666;
-                background-color: #fafafa !important;
-                font-size: 7pt;
-                line-height: 1.2;
-                padding: 4pt;
-                max-height: none;
-                overflow: visible;
-                page-break-inside: auto;
+            result.endpoints_results = endpoint_responses
+            
+            # Comparar respostas
+            validation = comparison.get('validation', {})
+            result.comparison_details['ignored_fields'] = validation.get('ignore_fields', [])
+            # ignore_fields aceita um único path (string) ou uma lista de paths
+            ignored_fields = result.comparison_details['ignored_fields']
+            ignored_fields = [ignored_fields] if isinstance(ignored_fields, str) else list(ignored_fields or [])
+            
+            # Comparar status codes
+            if validation.get('compare_status', True):
+                status_codes = [r['status_code'] for r in endpoint_responses]
+                result.comparison_details['status_match'] = all(s == status_codes[0] for s in status_codes)
+            else:
+                result.comparison_details['status_match'] = True
+            
+            # Comparar bodies
+            if validation.get('compare_body', True):
+                bodies = [r['body'] for r in endpoint_responses]
+                
+                # Se todos são JSON, usar DeepDiff
+                if all(isinstance(b, dict) or isinstance(b, list) for b in bodies):
+                    # Comparar o primeiro com todos os outros
+                    all_match = True
+                    differences = []
+                    ignore_order = validation.get('ignore_order', True)
+                    
+                    # Forma canônica de cada body distinto (já sem os campos ignorados) calculada uma única vez;
+                    # bodies com a mesma forma canônica não têm diferenças para o DeepDiff
+                    ignored_key_paths = self._ignored_key_paths(ignored_fields)
+                    canonical_bodies = {}
+                    for b in bodies:
+                        if id(b) not in canonical_bodies:
+                            canonical_bodies[id(b)] = (
+                                None if id(b) in inexact_bodies
+                                else self._canonical_body(b, ignore_order, ignored_key_paths)
+                            )
+                    
+                    # Opções do DeepDiff montadas uma única vez para todos os pares.
+                    # threshold_to_diff_deeper=0 evita recalcular o conjunto de paths excluídos a cada dict
+                    deepdiff_options = {
+                        'ignore_order': ignore_order,
+                        'exclude_paths': set(ignored_fields),
+                        'cache_size': 500,
+                        'cache_tuning_sample_size': 500,
+                        'get_deep_distance': False,
+                        'threshold_to_diff_deeper': 0
+                    }
+                    
+                    for i in range(1, len(bodies)):
+                        # Bodies idênticos dispensam o DeepDiff
+                        canonical = canonical_bodies[id(bodies[i])]
+                        if canonical is not None and canonical == canonical_bodies[id(bodies[0])]:
+                            continue
+                        
+                        diff = DeepDiff(bodies[0], bodies[i], **deepdiff_options)
+                        
+                        if diff:
+                            all_match = False
+                            differences.append({
+                                'endpoint1': endpoint_responses[0]['name'],
+                                'endpoint2': endpoint_responses[i]['name'],
+                                'diff': diff.to_dict()
+                            })
+                    
+                    result.comparison_details['body_match'] = all_match
+                    result.comparison_details['differences'] = differences
+                else:
+                    # Comparação simples de strings
+                    result.comparison_details['body_match'] = all(b == bodies[0] for b in bodies)
+                    if not result.comparison_details['body_match']:
+                        result.comparison_details['differences'] = "Conteúdo diferente (não-JSON)"
+            else:
+                result.comparison_details['body_match'] = True
+            
+            # Determinar sucesso geral
+            result.success = (
+                result.comparison_details['status_match'] and 
+                result.comparison_details['body_match']
+            )
+            
+        except Exception as e:
+            result.success = False
+            result.error_message = f"Erro durante comparação: {str(e)}"
+        
+        return result
+    
+    def _execute_endpoint(self, endpoint: Dict[str, Any], endpoint_name: str, local_uuid: str) -> Dict[str, Any]:
+        """Executa a requisição de um endpoint de uma comparação"""
+        # Preparar configuração do teste
+        test_config = {
+            'name': endpoint_name,
+            'request': endpoint['request'],
+            'local_uuid': local_uuid,
+        }
+        
+        # Usar base_url específica se fornecida
+        base_url = endpoint.get('base_url')
+        response, request_body = self._execute_request(test_config, base_url=base_url)
+        
+        response_data = {
+            'name': endpoint_name,
+            'status_code': response.status_code,
+            'headers': dict(response.headers) if self._include_response_details else None,
+            'body': None,
+            'request_details': {
+                'base_url': base_url or self.base_url,
+                'method': endpoint['request']['method'].upper(),
+                'path': endpoint['request'].get('path', '/'),
+                'full_url': response.request.url,
+                'headers': dict(response.request.headers) if self._include_request_details else None,
+                'query_params': dict(response.request.query_params) if hasattr(response.request, 'query_params') else {},
+                'body': request_body
             }
+        }
+        
+        # Adicionar query params se existirem no endpoint
+        if 'query_params' in endpoint['request']:
+            response_data['request_details']['configured_params'] = self._replace_variables(endpoint['request']['query_params'], local_uuid)
+        
+        # Tentar parsear JSON da resposta
+        response_data['body'], _, response_data['body_via_orjson'] = self._parse_response_body(response)
+        # Conteúdo bruto (com o encoding declarado, que muda a decodificação) mantido só até
+        # _execute_comparison agrupar respostas idênticas
+        response_data['body_raw'] = (response.encoding, response.content)
+        
+        # Liberar a resposta (conteúdo e conexão) assim que o body foi extraído
+        response.close()
+        
+        return response_data
+    
+    def _canonical_body(self, body: Union[Dict, List], ignore_order: bool = True,
+                        ignored_key_paths: List[tuple] = ()) -> Union[bytes, None]:
+        """Serializa o body de forma canônica (sem os campos ignorados, chaves e, se ignore_order, itens da lista raiz ordenados)"""
+        for keys in ignored_key_paths:
+            body = self._without_key_path(body, keys)
+        
+        try:
+            if ignore_order and isinstance(body, list):
+                return b'[' + b','.join(sorted(orjson.dumps(item, option=_ORJSON_OPT_CANONICAL) for item in body)) + b']'
+            return orjson.dumps(body, option=_ORJSON_OPT_CANONICAL)
+        except TypeError:
+            # Inteiros acima de 64 bits: sem forma canônica, a comparação fica com o DeepDiff
+            return None
+    
+    def _ignored_key_paths(self, ignored_fields: List[str]) -> List[tuple]:
+        """Converte os ignore_fields que apontam apenas para chaves de dicts (ex.: root['a']['b']) em tuplas de chaves"""
+        key_paths = []
+        for path in add_root_to_paths(ignored_fields) or []:
+            try:
+                keys = parse_path(path)
+            except Exception:
+                continue
+            # Só é seguro remover o campo se o path for exatamente o que o DeepDiff geraria para ele
+            if keys and all(isinstance(k, str) for k in keys) and path == 'root' + ''.join(f'[{k!r}]' for k in keys):
+                key_paths.append(tuple(keys))
+        return key_paths
+    
+    def _without_key_path(self, obj: Any, keys: tuple) -> Any:
+        """Retorna uma cópia de obj sem o campo indicado por keys (obj não é modificado)"""
+        if not isinstance(obj, dict) or keys[0] not in obj:
+            return obj
+        if len(keys) == 1:
+            return {k: v for k, v in obj.items() if k != keys[0]}
+        
+        child = self._without_key_path(obj[keys[0]], keys[1:])
+        if child is obj[keys[0]]:
+            return obj
+        copy = dict(obj)
+        copy[keys[0]] = child
+        return copy
+    
+    def run_tests(self):
+        """Executa todos os testes configurados"""
+        tests = self.config.get('tests', [])
+        comparisons = self.config.get('comparisons', [])
+        report_config = self.config.get('report', {})
+        verbose = report_config.get('verbose', True)
+        stop_on_failure = report_config.get('stop_on_failure', False)
+        
+        # Executar testes normais
+        if tests:
+            print(f"\n{'='*60}")
+            print(f"Executando {len([t for t in tests if t.get('enabled', True)])} testes de API")
+            print(f"Base URL: {self.base_url}")
+            print(f"{'='*60}\n")
+            
+            # Com stop_on_failure os testes são executados um a um para que nenhuma
+            # requisição seja disparada após a primeira falha
+            enabled_tests = [t for t in tests if t.get('enabled', True)]
+            if stop_on_failure:
+                test_results = map(self._execute_test, enabled_tests)
+            else:
+                test_results = self._map(self._execute_test, enabled_tests)
+            
+            for test in tests:
+                if not test.get('enabled', True):
+                    print(f"⏭️  {test['name']} - DESABILITADO")
+                    continue
+                
+                self._log_test_start(test)
+                
+                result = next(test_results)
+                self.results.append(result)
+                
+                if result.success:
+                    print(f"✅ {test['name']} - SUCESSO ({result.execution_time:.2f}s)")
+                else:
+                    print(f"❌ {test['name']} - FALHA (Status: {result.status_code})")
+                    if verbose and result.error_message:
+                        print(f"   Erro: {result.error_message}")
+                
+                # Mostrar detalhes da validação se verbose
+                if verbose and result.validation_details:
+                    if result.validation_details.get('validations_passed'):
+                        for validation in result.validation_details['validations_passed']:
+                            print(f"   ✅ {validation}")
+                    if result.validation_details.get('validations_failed'):
+                        for validation in result.validation_details['validations_failed']:
+                            print(f"   ❌ {validation}")
+                
+                if verbose and result.request_details:
+                    print(f"   URL: {result.request_details.get('url', 'N/A')}")
+                
+                # Mostrar response se configurado
+                if report_config.get('show_response_in_console', False):
+                    self._show_response_in_console(result, report_config)
+                
+                if stop_on_failure and not result.success:
+                    print("\n⚠️  Parando execução devido a falha (stop_on_failure=true)")
+                    break
+        
+        # Executar comparações
+        if comparisons:
+            print(f"\n{'='*60}")
+            print(f"Executando {len([c for c in comparisons if c.get('enabled', True)])} comparações entre endpoints")
+            print(f"{'='*60}\n")
             
-            /* Cores de diff em tons de cinza */
-            .diff-removed {
-                background-color: #f0f0f0 !important;
-                border-left: 3pt solid #666 !important;
-                color: #000 !important;
-                text-decoration: line-through;
-            }
+            for comparison in comparisons:
+                if not comparison.get('enabled', True):
+                    print(f"⏭️  {comparison['name']} - DESABILITADO")
+                    continue
+                
+                result = self._execute_comparison(comparison)
+                self.comparison_results.append(result)
+                
+                if result.success:
+                    print(f"✅ {comparison['name']} - ENDPOINTS IDÊNTICOS")
+                else:
+                    print(f"❌ {comparison['name']} - ENDPOINTS DIFERENTES")
+                    if result.error_message:
+                        print(f"   Erro: {result.error_message}")
+                    else:
+                        if not result.comparison_details['status_match']:
+                            print(f"   ❌ Status codes diferentes")
+                        if not result.comparison_details['body_match']:
+                            print(f"   ❌ Conteúdo dos bodies diferentes")
+        
+        self._generate_report()
+    
+    def _log_test_start(self, test: Dict[str, Any]):
+        """Mostra o cabeçalho do teste no console (apenas em modo verbose)"""
+        if not self._verbose:
+            return
+        print(
+            f"🧪 Executando: {test['name']}\n"
+            f"   Descrição: {test.get('description', 'N/A')}\n"
+            f"   Método: {test['request']['method']} {test['request']['path']}"
+        )
+    
+    def _show_response_in_console(self, result: TestResult, report_config: Dict[str, Any]):
+        """Mostra o response no console de acordo com as configurações"""
+        if not result.response_data:
+            return
+        
+        format_json = report_config.get('format_json_response', True)
+        max_length = report_config.get('max_response_display_length', 1000)
+        
+        print(f"   📄 Response (Status {result.status_code}):")
+        
+        try:
+            # Se response_data é um dict (JSON), formatá-lo
+            if isinstance(result.response_data, dict) and format_json:
+                response_text = _dumps_pretty(result.response_data).decode('utf-8')
+            else:
+                response_text = str(result.response_data)
             
-            .diff-added {
-                background-color: #e8e8e8 !important;
-                border-left: 3pt solid #333 !important;
-                color: #000 !important;
-                font-weight: bold;
-            }
+            # Limitar tamanho se configurado
+            if max_length > 0 and len(response_text) > max_length:
+                response_text = response_text[:max_length] + "... [truncado]"
             
-            .diff-modified {
-                background-color: #f5f5f5 !important;
-                border-left: 3pt dotted #666 !important;
-                color: #000 !important;
-            }
+            # Indentar todas as linhas para ficar alinhado
+            lines = response_text.split('\n')
+            for line in lines:
+                print(f"      {line}")
+                
+        except Exception as e:
+            print(f"      Erro ao formatar response: {e}")
+        
+        print()  # Linha em branco
+
+    def _generate_report(self):
+        """Gera relatório dos testes"""
+        report_config = self.config.get('report', {})
+        
+        total_tests = len(self.results)
+        successful_tests = sum(1 for r in self.results if r.success)
+        failed_tests = total_tests - successful_tests
+        
+        print(f"\n{'='*60}")
+        print("RESUMO DOS TESTES")
+        print(f"{'='*60}")
+        print(f"Total de testes: {total_tests}")
+        print(f"✅ Sucessos: {successful_tests}")
+        print(f"❌ Falhas: {failed_tests}")
+        if total_tests > 0:
+            print(f"Taxa de sucesso: {(successful_tests/total_tests*100):.1f}%")
+        
+        if failed_tests > 0:
+            print("\nTestes que falharam:")
+            for result in self.results:
+                if not result.success:
+                    print(f"  - {result.test_name}: {result.error_message or f'Status {result.status_code}'}")
+        
+        # Resumo das comparações
+        if self.comparison_results:
+            total_comparisons = len(self.comparison_results)
+            successful_comparisons = sum(1 for c in self.comparison_results if c.success)
+            failed_comparisons = total_comparisons - successful_comparisons
             
-            .diff-unchanged {
-                color: #333 !important;
-            }
+            print(f"\n{'='*60}")
+            print("RESUMO DAS COMPARAÇÕES")
+            print(f"{'='*60}")
+            print(f"Total de comparações: {total_comparisons}")
+            print(f"✅ Idênticas: {successful_comparisons}")
+            print(f"❌ Diferentes: {failed_comparisons}")
             
-            .char-removed {
-                background-color: #d0d0d0 !important;
-                text-decoration: line-through !important;
-            }
+            if failed_comparisons > 0:
+                print("\nComparações com diferenças:")
+                for result in self.comparison_results:
+                    if not result.success:
+                        print(f"  - {result.comparison_name}")
+        
+        # Salvar resultados se configurado
+        if report_config.get('save_results', True):
+            output_file = report_config.get('output_file', 'test_results.json')
+            self._save_results(output_file, report_config)
+            print(f"\n📄 Resultados salvos em: {output_file}")
             
-            .char-added {
-                background-color: #c0c0c0 !important;
-                font-weight: bold !important;
+            # Gerar relatório HTML de comparações se houver comparações
+            if self.comparison_results:
+                html_file = report_config.get('comparison_report', 'comparison_report.html')
+                try:
+                    self._generate_html_comparison_report_simple(html_file)
+
+                    webbrowser.open(os.path.abspath(html_file))
+                except Exception as e:
+                    print(f"Erro ao gerar HTML: {e}")
+                print(f"📄 Relatório HTML de comparações salvo em: {html_file}")
+    
+    def _save_results(self, filename: str, report_config: Dict[str, Any]):
+        """Salva os resultados em arquivo JSON"""
+        include_request = report_config.get('include_request_details', True)
+        include_response = report_config.get('include_response_details', True)
+        
+        results_data = {
+            'timestamp': datetime.now().isoformat(),
+            'config': {
+                'base_url': self.base_url,
+                'timeout': self.timeout,
+                'config_file': self.config_file
+            },
+            'summary': {
+                'tests': {
+                    'total': len(self.results),
+                    'success': sum(1 for r in self.results if r.success),
+                    'failed': sum(1 for r in self.results if not r.success)
+                },
+                'comparisons': {
+                    'total': len(self.comparison_results),
+                    'identical': sum(1 for c in self.comparison_results if c.success),
+                    'different': sum(1 for c in self.comparison_results if not c.success)
+                }
+            },
+            'results': [],
+            'comparisons': []
+        }
+        
+        for result in self.results:
+            test_result = {
+                'test_name': result.test_name,
+                'success': result.success,
+                'status_code': result.status_code,
+                'execution_time': result.execution_time,
+                'timestamp': result.timestamp,
+                'error_message': result.error_message,
+                'validation_details': result.validation_details
             }
             
-            .char-modified {
-                background-color: #e0e0e0 !important;
-                font-weight: bold !important;
-            }
+            if include_request:
+                test_result['request'] = result.request_details
             
-            /* Request details */
-            .request-details {
-                background-color: #f8f8f8 !important;
-                border: 1pt solid #666;
-                font-size: 6pt;
-                padding: 3pt;
-                margin-bottom: 4pt;
-                page-break-inside: avoid;
-            }
+            if include_response:
+                test_result['response'] = {
+                    'status_code': result.status_code,
+                    'headers': result.response_headers,
+                    'body': result.response_data
+                }
             
-            .request-details code {
-                background-color: #e8e8e8 !important;
-                font-size: 6pt;
-                padding: 0.5pt 1pt;
+            results_data['results'].append(test_result)
+        
+        # Adicionar resultados das comparações
+        for comparison in self.comparison_results:
+            comparison_result = {
+                'comparison_name': comparison.comparison_name,
+                'success': comparison.success,
+                'timestamp': comparison.timestamp,
+                'error_message': comparison.error_message,
+                'comparison_details': comparison.comparison_details,
+                'endpoints_results': []
             }
             
-            /* Banners de resultado */
-            .result-banner {
-                border: 2pt solid #333;
-                background-color: #f0f0f0 !important;
-                color: #000 !important;
-                font-size: 11pt;
-                font-weight: bold;
-                padding: 8pt;
-                margin: 10pt 0;
-                page-break-inside: avoid;
-                page-break-after: avoid;
-            }
+            # Incluir detalhes de cada endpoint
+            for endpoint in comparison.endpoints_results:
+                endpoint_data = {
+                    'name': endpoint['name'],
+                    'status_code': endpoint['status_code'],
+                    'headers': endpoint['headers'],
+                    'body': endpoint['body']
+                }
+                comparison_result['endpoints_results'].append(endpoint_data)
             
-            .result-success {
-                border-style: solid;
-            }
+            results_data['comparisons'].append(comparison_result)
+        
+        with open(filename, 'wb') as f:
+            f.write(_dumps_pretty(results_data))
+    
+    def _generate_html_comparison_report_simple(self, filename: str):
+        """Gera relatório HTML com diferenças visuais detalhadas entre endpoints"""
+        # Gravação incremental: cada comparação é codificada e escrita ao final
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            write = f.write
+            write(_HTML_HEADER)
+            write(f'<h1>🔍 Relatório de Comparação de Endpoints</h1>'.encode('utf-8'))
+            write(f'<p style="text-align: center; color: #666; margin-bottom: 2.5rem;">Gerado em: {datetime.now().strftime("%d/%m/%Y às %H:%M:%S")}</p>'.encode('utf-8'))
             
-            .result-failure {
-                border-style: double;
-                background-color: #e0e0e0 !important;
-            }
+            # Legenda
+            write(_HTML_LEGEND)
             
-            /* Legenda */
-            .legend {
-                border: 1pt solid #666;
-                padding: 8pt;
-                margin-bottom: 15pt;
-                page-break-inside: avoid;
-                background-color: #fafafa;
-                font-size: 9pt;
-            }
+            # Comparações gravadas na ordem original assim que cada uma é renderizada
+            for fragment in self._render_comparisons():
+                write(fragment.encode('utf-8'))
             
-            .legend-item {
-                margin-right: 15pt;
-            }
+            write(b'</div></body></html>') # Close main-container
+    
+    def _render_comparisons(self):
+        """Gera os fragmentos HTML das comparações na ordem; em paralelo apenas em builds sem GIL"""
+        # Com GIL o diff (Python puro) não ganha nada com threads: renderização sequencial
+        gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+        if self._executor is None or gil_enabled:
+            yield from map(self._render_comparison, self.comparison_results)
+            return
+        
+        # Janela limitada de tarefas em andamento, para não acumular o relatório inteiro em memória
+        window = 2 * self.concurrency
+        pending = deque()
+        for result in self.comparison_results:
+            pending.append(self._executor.submit(self._render_comparison, result))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    
+    def _render_comparison(self, result: ComparisonResult) -> str:
+        """Renderiza o fragmento HTML de uma comparação do relatório simples"""
+        parts = []
+        parts.append(f'<h2>📊 {_esc(result.comparison_name)}</h2>')
+        
+        # Banner de resultado (sucesso ou falha)
+        if result.success:
+            parts.append(f'<div class="result-banner result-success">✅ COMPARAÇÃO IDÊNTICA - SUCESSO</div>')
+        else:
+            parts.append(f'<div class="result-banner result-failure">❌ COMPARAÇÃO DIFERENTE - FALHA</div>')
+        
+        # Gerar diff visual se houver exatamente 2 endpoints
+        if len(result.endpoints_results) == 2:
+            endpoint1 = result.endpoints_results[0]
+            endpoint2 = result.endpoints_results[1]
             
-            .legend-color {
-                border: 1pt solid #333 !important;
-                width: 12pt;
-                height: 12pt;
-                display: inline-block;
-                vertical-align: middle;
-            }
+            parts.append('<div class="comparison-container">')
             
-            /* Remover elementos desnecessários na impressão */
-            .legend-color:nth-child(1) {
-                background-color: #f0f0f0 !important;
-            }
+            # Gerar conteúdo formatado para ambos endpoints
+            content1 = self._formatted_body(endpoint1)
+            content2 = content1 if endpoint2['body'] is endpoint1['body'] else self._formatted_body(endpoint2)
             
-            .legend-color:nth-child(2) {
-                background-color: #e0e0e0 !important;
-            }
+            # Gerar diff visual
+            diff_html1, diff_html2 = self._generate_visual_diff(content1, content2, endpoint1['name'], endpoint2['name'])
             
-            .legend-color:nth-child(3) {
-                background-color: #d0d0d0 !important;
-            }
+            # Endpoint 1
+            parts.append('<div class="endpoint-container">')
+            parts.append(f'<h3>🌐 {_esc(endpoint1["name"])}</h3>')
+            status_class = _STATUS_CLASS.get(endpoint1["status_code"] // 100, "status-5xx")
+            parts.append(f'<div class="status-badge {status_class}">Status: {endpoint1["status_code"]}</div>')
             
-            /* Garantir que o texto seja sempre legível */
-            * {
-                color-adjust: exact;
-                -webkit-print-color-adjust: exact;
-                print-color-adjust: exact;
-            }
+            # Detalhes do request
+            if 'request_details' in endpoint1:
+                parts.append(self._render_request_details(endpoint1['request_details']))
             
-            /* Evitar quebras ruins em elementos importantes */
-            h1, h2, h3, .result-banner, .legend {
-                page-break-after: avoid;
-            }
+            parts.append('<div class="payload">')
+            parts.append(diff_html1)
+            parts.append('</div></div>')
             
-            /* Forçar nova página antes de cada comparação principal */
-            h2:not(:first-of-type) {
-                page-break-before: auto;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="main-container">''')
+            # Endpoint 2
+            parts.append('<div class="endpoint-container">')
+            parts.append(f'<h3>🌐 {_esc(endpoint2["name"])}</h3>')
+            status_class = _STATUS_CLASS.get(endpoint2["status_code"] // 100, "status-5xx")
+            parts.append(f'<div class="status-badge {status_class}">Status: {endpoint2["status_code"]}</div>')
             
-            f.write(f'<h1>🔍 Relatório de Comparação de Endpoints</h1>')
-            f.write(f'<p style="text-align: center; color: #666; margin-bottom: 2.5rem;">Gerado em: {datetime.now().strftime("%d/%m/%Y às %H:%M:%S")}</p>')
+            # Detalhes do request
+            if 'request_details' in endpoint2:
+                parts.append(self._render_request_details(endpoint2['request_details']))
             
-            # Legenda
-            f.write('''<div class="legend">
-                <div class="legend-item">
-                    <div class="legend-color" style="background-color: #ffeaea; border: 1px solid #f56565;"></div>
-                    <span>Removido</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background-color: #f0fff4; border: 1px solid #48bb78;"></div>
-                    <span>Adicionado</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background-color: #fff8dc; border: 1px solid #ed8936;"></div>
-                    <span>Modificado</span>
-                </div>
-            </div>''')
+            parts.append('<div class="payload">')
+            parts.append(diff_html2)
+            parts.append('</div></div>')
             
-            for result in self.comparison_results:
-                f.write(f'<h2>📊 {html.escape(result.comparison_name)}</h2>')
-                
-                # Banner de resultado (sucesso ou falha)
-                if result.success:
-                    f.write(f'<div class="result-banner result-success">✅ COMPARAÇÃO IDÊNTICA - SUCESSO</div>')
-                else:
-                    f.write(f'<div class="result-banner result-failure">❌ COMPARAÇÃO DIFERENTE - FALHA</div>')
-                
-                # Gerar diff visual se houver exatamente 2 endpoints
-                if len(result.endpoints_results) == 2:
-                    endpoint1 = result.endpoints_results[0]
-                    endpoint2 = result.endpoints_results[1]
-                    
-                    f.write('<div class="comparison-container">')
-                    
-                    # Gerar conteúdo formatado para ambos endpoints
-                    content1 = self._format_json_content(endpoint1['body'])
-                    content2 = self._format_json_content(endpoint2['body'])
-                    
-                    # Gerar diff visual
-                    diff_html1, diff_html2 = self._generate_visual_diff(content1, content2, endpoint1['name'], endpoint2['name'])
-                    
-                    # Endpoint 1
-                    f.write('<div class="endpoint-container">')
-                    f.write(f'<h3>🌐 {html.escape(endpoint1["name"])}</h3>')
-                    status_class = "status-2xx" if 200 <= endpoint1["status_code"] < 300 else "status-4xx" if 400 <= endpoint1["status_code"] < 500 else "status-5xx"
-                    f.write(f'<div class="status-badge {status_class}">Status: {endpoint1["status_code"]}</div>')
-                    
-                    # Detalhes do request
-                    if 'request_details' in endpoint1:
-                        req = endpoint1['request_details']
-                        f.write('<div class="request-details">')
-                        f.write(f'<strong>🔗 Base URL:</strong> {html.escape(req.get("base_url", "N/A"))}<br>')
-                        f.write(f'<strong>📍 Request:</strong> {html.escape(req.get("method", ""))} {html.escape(req.get("path", ""))}<br>')
-                        f.write(f'<strong>🌐 Full URL:</strong> {html.escape(req.get("full_url", ""))}<br>')
-                        
-                        # Exibir query parameters de forma mais legível
-                        if req.get('configured_params'):
-                            f.write('<strong>🔍 Query Parameters:</strong><br>')
-                            for param_name, param_value in req['configured_params'].items():
-                                f.write(f'&nbsp;&nbsp;&nbsp;&nbsp;• <code>{html.escape(param_name)}</code> = <code>{html.escape(str(param_value))}</code><br>')
-                        
-                        if req.get('body'):
-                            f.write(f'<strong>📦 Body:</strong> {html.escape(str(req["body"]))}<br>')
-                        f.write('</div>')
-                    
-                    f.write('<div class="payload">')
-                    f.write(diff_html1)
-                    f.write('</div></div>')
-                    
-                    # Endpoint 2
-                    f.write('<div class="endpoint-container">')
-                    f.write(f'<h3>🌐 {html.escape(endpoint2["name"])}</h3>')
-                    status_class = "status-2xx" if 200 <= endpoint2["status_code"] < 300 else "status-4xx" if 400 <= endpoint2["status_code"] < 500 else "status-5xx"
-                    f.write(f'<div class="status-badge {status_class}">Status: {endpoint2["status_code"]}</div>')
-                    
-                    # Detalhes do request
-                    if 'request_details' in endpoint2:
-                        req = endpoint2['request_details']
-                        f.write('<div class="request-details">')
-                        f.write(f'<strong>🔗 Base URL:</strong> {html.escape(req.get("base_url", "N/A"))}<br>')
-                        f.write(f'<strong>📍 Request:</strong> {html.escape(req.get("method", ""))} {html.escape(req.get("path", ""))}<br>')
-                        f.write(f'<strong>🌐 Full URL:</strong> {html.escape(req.get("full_url", ""))}<br>')
-                        
-                        # Exibir query parameters de forma mais legível
-                        if req.get('configured_params'):
-                            f.write('<strong>🔍 Query Parameters:</strong><br>')
-                            for param_name, param_value in req['configured_params'].items():
-                                f.write(f'&nbsp;&nbsp;&nbsp;&nbsp;• <code>{html.escape(param_name)}</code> = <code>{html.escape(str(param_value))}</code><br>')
-                        
-                        if req.get('body'):
-                            f.write(f'<strong>📦 Body:</strong> {html.escape(str(req["body"]))}<br>')
-                        f.write('</div>')
-                    
-                    f.write('<div class="payload">')
-                    f.write(diff_html2)
-                    f.write('</div></div>')
-                    
-                    f.write('</div>')
-                else:
-                    # Fallback para mais de 2 endpoints (formato original)
-                    f.write('<div class="comparison-container">')
-                    for endpoint in result.endpoints_results:
-                        f.write('<div class="endpoint-container">')
-                        f.write(f'<h3>🌐 {html.escape(endpoint["name"])}</h3>')
-                        status_class = "status-2xx" if 200 <= endpoint["status_code"] < 300 else "status-4xx" if 400 <= endpoint["status_code"] < 500 else "status-5xx"
-                        f.write(f'<div class="status-badge {status_class}">Status: {endpoint["status_code"]}</div>')
-                        f.write('<div class="payload">')
-                        content = self._format_json_content(endpoint['body'])
-                        f.write(html.escape(content))
-                        f.write('</div></div>')
-                    f.write('</div>')
-            
-            f.write('</div>') # Close main-container
-            f.write('</body></html>')
+            parts.append('</div>')
+        else:
+            # Fallback para mais de 2 endpoints (formato original)
+            parts.append('<div class="comparison-container">')
+            for endpoint in result.endpoints_results:
+                parts.append('<div class="endpoint-container">')
+                parts.append(f'<h3>🌐 {_esc(endpoint["name"])}</h3>')
+                status_class = _STATUS_CLASS.get(endpoint["status_code"] // 100, "status-5xx")
+                parts.append(f'<div class="status-badge {status_class}">Status: {endpoint["status_code"]}</div>')
+                parts.append('<div class="payload">')
+                content = self._formatted_body(endpoint)
+                parts.append(_esc(content))
+                parts.append('</div></div>')
+            parts.append('</div>')
+        
+        return ''.join(parts)
+    
+    def _render_request_details(self, req: Dict[str, Any]) -> str:
+        """Renderiza o bloco de detalhes do request de um endpoint em uma única formatação"""
+        # Exibir query parameters de forma mais legível
+        params_html = ''
+        if req.get('configured_params'):
+            params_html = '<strong>🔍 Query Parameters:</strong><br>' + ''.join(
+                _REQ_PARAM_TMPL % (_esc(param_name), _esc(str(param_value)))
+                for param_name, param_value in req['configured_params'].items()
+            )
+        
+        body_html = ''
+        if req.get('body'):
+            body_html = '<strong>📦 Body:</strong> %s<br>' % _esc(str(req['body']))
+        
+        return _REQ_TMPL % (
+            _esc(req.get('base_url', 'N/A')),
+            _esc(req.get('method', '')),
+            _esc(req.get('path', '')),
+            _esc(req.get('full_url', '')),
+            params_html,
+            body_html
+        )
+    
+    def _formatted_body(self, endpoint: Dict[str, Any]) -> str:
+        """Retorna o body formatado do endpoint, calculado uma única vez e guardado no próprio dict"""
+        formatted = endpoint.get('body_formatted')
+        if formatted is None:
+            formatted = endpoint['body_formatted'] = self._format_json_content(endpoint['body'])
+        return formatted
     
     def _format_json_content(self, body):
         """Formata o conteúdo JSON para exibição"""
         if isinstance(body, (dict, list)):
-            return json.dumps(body, indent=2, ensure_ascii=False)
+            return _dumps_pretty(body).decode('utf-8')
         else:
             return str(body)
     
@@ -1334,226 +1780,156 @@ class APIComparator:
         """Gera diff visual linha por linha entre dois conteúdos"""
         import difflib
         
+        # Conteúdos idênticos: todas as linhas inalteradas, mesmo HTML para os dois lados
+        if content1 == content2:
+            body = '\n'.join(f'<span class="d-u">{_esc(line)}</span>' for line in content1.splitlines())
+            return body, body
+        
         lines1 = content1.splitlines()
         lines2 = content2.splitlines()
         
-        # Usar difflib para gerar diff
-        diff = list(difflib.unified_diff(lines1, lines2, lineterm='', n=1000))
+        # Escapar cada linha uma única vez, reaproveitando nos ramos abaixo
+        esc1 = list(map(_esc, lines1))
+        esc2 = list(map(_esc, lines2))
         
         # Processar diff para gerar HTML
         html1_lines = []
         html2_lines = []
         
-        # Mapear linhas originais para o diff
-        matcher = difflib.SequenceMatcher(None, lines1, lines2)
+        # Descartar prefixo e sufixo comuns antes de rodar o matcher
+        n1, n2 = len(lines1), len(lines2)
+        limit = min(n1, n2)
+        prefix = 0
+        while prefix < limit and lines1[prefix] == lines2[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and lines1[n1 - 1 - suffix] == lines2[n2 - 1 - suffix]:
+            suffix += 1
         
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        # Mapear linhas originais para o diff (apenas o miolo divergente)
+        opcodes = [(tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                   for tag, i1, i2, j1, j2 in self._line_opcodes(lines1[prefix:n1 - suffix], lines2[prefix:n2 - suffix])]
+        if prefix:
+            opcodes.insert(0, ('equal', 0, prefix, 0, prefix))
+        if suffix:
+            opcodes.append(('equal', n1 - suffix, n1, n2 - suffix, n2))
+        # Matcher reaproveitado no diff de caracteres de cada par de linhas
+        char_matcher = difflib.SequenceMatcher(None)
+        
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == 'equal':
                 # Linhas iguais
                 for k in range(i1, i2):
-                    html1_lines.append(f'<div class="diff-line diff-unchanged">{html.escape(lines1[k])}</div>')
+                    html1_lines.append(f'<span class="d-u">{esc1[k]}</span>')
                 for k in range(j1, j2):
-                    html2_lines.append(f'<div class="diff-line diff-unchanged">{html.escape(lines2[k])}</div>')
+                    html2_lines.append(f'<span class="d-u">{esc2[k]}</span>')
             elif tag == 'delete':
                 # Linhas removidas (apenas em content1)
                 for k in range(i1, i2):
-                    html1_lines.append(f'<div class="diff-line diff-removed">{html.escape(lines1[k])}</div>')
+                    html1_lines.append(f'<span class="d-r">{esc1[k]}</span>')
             elif tag == 'insert':
                 # Linhas adicionadas (apenas em content2)
                 for k in range(j1, j2):
-                    html2_lines.append(f'<div class="diff-line diff-added">{html.escape(lines2[k])}</div>')
+                    html2_lines.append(f'<span class="d-a">{esc2[k]}</span>')
             elif tag == 'replace':
-                # Linhas modificadas
-                for k in range(i1, i2):
-                    line1 = lines1[k]
-                    # Tentar encontrar linha correspondente para diff de caracteres
-                    if k - i1 < j2 - j1:
-                        line2 = lines2[j1 + (k - i1)]
-                        char_diff1, char_diff2 = self._generate_char_diff(line1, line2)
-                        html1_lines.append(f'<div class="diff-line diff-modified">{char_diff1}</div>')
-                    else:
-                        html1_lines.append(f'<div class="diff-line diff-removed">{html.escape(line1)}</div>')
+                # Linhas modificadas: pares lado a lado, sobras como removidas/adicionadas
+                paired = min(i2 - i1, j2 - j1)
+                for n in range(paired):
+                    line1 = lines1[i1 + n]
+                    line2 = lines2[j1 + n]
+                    # Linhas muito diferentes em tamanho: diff de caracteres não compensa
+                    if abs(len(line1) - len(line2)) > 200:
+                        html1_lines.append(f'<span class="d-r">{esc1[i1 + n]}</span>')
+                        html2_lines.append(f'<span class="d-a">{esc2[j1 + n]}</span>')
+                        continue
+                    char_diff1, char_diff2 = self._generate_char_diff(line1, line2, char_matcher)
+                    html1_lines.append(f'<span class="d-m">{char_diff1}</span>')
+                    html2_lines.append(f'<span class="d-m">{char_diff2}</span>')
                 
-                for k in range(j1, j2):
-                    line2 = lines2[k]
-                    if k - j1 < i2 - i1:
-                        line1 = lines1[i1 + (k - j1)]
-                        char_diff1, char_diff2 = self._generate_char_diff(line1, line2)
-                        html2_lines.append(f'<div class="diff-line diff-modified">{char_diff2}</div>')
-                    else:
-                        html2_lines.append(f'<div class="diff-line diff-added">{html.escape(line2)}</div>')
+                for k in range(i1 + paired, i2):
+                    html1_lines.append(f'<span class="d-r">{esc1[k]}</span>')
+                for k in range(j1 + paired, j2):
+                    html2_lines.append(f'<span class="d-a">{esc2[k]}</span>')
         
         # Equalizar o número de linhas
-        while len(html1_lines) < len(html2_lines):
-            html1_lines.append('<div class="diff-line"></div>')
-        while len(html2_lines) < len(html1_lines):
-            html2_lines.append('<div class="diff-line"></div>')
+        missing = len(html2_lines) - len(html1_lines)
+        if missing > 0:
+            html1_lines.extend([''] * missing)
+        elif missing < 0:
+            html2_lines.extend([''] * -missing)
         
         return '\n'.join(html1_lines), '\n'.join(html2_lines)
     
-    def _generate_char_diff(self, line1: str, line2: str):
+    def _line_opcodes(self, lines1: List[str], lines2: List[str]) -> List[tuple]:
+        """Opcodes no formato do SequenceMatcher; usa o Myers do diff_match_patch quando instalado"""
+        import difflib
+        
+        if diff_match_patch is None or not lines1 or not lines2:
+            return difflib.SequenceMatcher(None, lines1, lines2).get_opcodes()
+        
+        # Modo linha: cada linha vira um caractere e o diff roda sobre essas strings
+        dmp = diff_match_patch()
+        chars1, chars2, _ = dmp.diff_linesToChars('\n'.join(lines1) + '\n', '\n'.join(lines2) + '\n')
+        
+        opcodes = []
+        i = j = 0
+        for op, text in dmp.diff_main(chars1, chars2, False):
+            n = len(text)
+            if op == dmp.DIFF_EQUAL:
+                opcodes.append(('equal', i, i + n, j, j + n))
+                i += n
+                j += n
+                continue
+            if op == dmp.DIFF_DELETE:
+                new = ('delete', i, i + n, j, j)
+                i += n
+            else:
+                new = ('insert', i, i, j, j + n)
+                j += n
+            # Remoção seguida de inserção (ou o inverso) vira 'replace', como no difflib
+            if opcodes and opcodes[-1][0] in ('delete', 'insert') and opcodes[-1][0] != new[0]:
+                _, i1, _, j1, _ = opcodes.pop()
+                new = ('replace', i1, i, j1, j)
+            opcodes.append(new)
+        return opcodes
+    
+    def _generate_char_diff(self, line1: str, line2: str, matcher=None):
         """Gera diff a nível de caracteres entre duas linhas"""
         import difflib
         
-        matcher = difflib.SequenceMatcher(None, line1, line2)
+        if matcher is None:
+            matcher = difflib.SequenceMatcher(None)
+        # set_seq2 indexa line2; set_seq1 é barato
+        matcher.set_seq2(line2)
+        matcher.set_seq1(line1)
         
         result1 = []
         result2 = []
         
         for tag, i1, i2, j1, j2 in matcher.get_opcodes():
             if tag == 'equal':
-                text = html.escape(line1[i1:i2])
+                text = _esc(line1[i1:i2])
                 result1.append(text)
                 result2.append(text)
             elif tag == 'delete':
-                result1.append(f'<span class="char-removed">{html.escape(line1[i1:i2])}</span>')
+                result1.append(f'<span class="char-removed">{_esc(line1[i1:i2])}</span>')
             elif tag == 'insert':
-                result2.append(f'<span class="char-added">{html.escape(line2[j1:j2])}</span>')
+                result2.append(f'<span class="char-added">{_esc(line2[j1:j2])}</span>')
             elif tag == 'replace':
-                result1.append(f'<span class="char-modified">{html.escape(line1[i1:i2])}</span>')
-                result2.append(f'<span class="char-modified">{html.escape(line2[j1:j2])}</span>')
+                result1.append(f'<span class="char-modified">{_esc(line1[i1:i2])}</span>')
+                result2.append(f'<span class="char-modified">{_esc(line2[j1:j2])}</span>')
         
         return ''.join(result1), ''.join(result2)
     
     def _generate_html_comparison_report(self, filename: str):
         """Gera relatório HTML com as diferenças visuais entre endpoints"""
-        html_content = """
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Relatório de Comparação de Endpoints</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-            color: #333;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1, h2, h3 {
-            color: #2c3e50;
-        }
-        .summary {
-            background-color: #f8f9fa;
-            padding: 20px;
-            border-radius: 5px;
-            margin-bottom: 30px;
-        }
-        .comparison {
-            margin-bottom: 40px;
-            border: 1px solid #e0e0e0;
-            border-radius: 5px;
-            overflow: hidden;
-        }
-        .comparison-header {
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-bottom: 1px solid #e0e0e0;
-        }
-        .comparison-header.success {
-            background-color: #d4edda;
-            border-color: #c3e6cb;
-        }
-        .comparison-header.failure {
-            background-color: #f8d7da;
-            border-color: #f5c6cb;
-        }
-        .endpoints {
-            display: flex;
-            gap: 20px;
-            padding: 20px;
-        }
-        .endpoint {
-            flex: 1;
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-radius: 5px;
-        }
-        .endpoint h4 {
-            margin-top: 0;
-            color: #495057;
-        }
-        .status-code {
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-weight: bold;
-            font-size: 14px;
-        }
-        .status-2xx { background-color: #d4edda; color: #155724; }
-        .status-3xx { background-color: #fff3cd; color: #856404; }
-        .status-4xx { background-color: #f8d7da; color: #721c24; }
-        .status-5xx { background-color: #f8d7da; color: #721c24; }
-        .differences {
-            margin: 20px;
-            padding: 20px;
-            background-color: #fff5f5;
-            border: 1px solid #ffdddd;
-            border-radius: 5px;
-        }
-        .diff-item {
-            margin-bottom: 15px;
-            padding: 10px;
-            background-color: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 3px;
-        }
-        .diff-type {
-            font-weight: bold;
-            color: #d73a49;
-            margin-bottom: 5px;
-        }
-        .diff-detail {
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 13px;
-            background-color: #f6f8fa;
-            padding: 8px;
-            border-radius: 3px;
-            overflow-x: auto;
-        }
-        .json-content {
-            background-color: #f6f8fa;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        pre {
-            margin: 0;
-            white-space: pre-wrap;
-            word-wrap: break-word;
-        }
-        .timestamp {
-            color: #6c757d;
-            font-size: 14px;
-        }
-        .badge {
-            display: inline-block;
-            padding: 4px 8px;
-            font-size: 12px;
-            font-weight: bold;
-            border-radius: 3px;
-            text-transform: uppercase;
-        }
-        .badge-success { background-color: #28a745; color: white; }
-        .badge-danger { background-color: #dc3545; color: white; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Relatório de Comparação de Endpoints</h1>
-        <p class="timestamp">Gerado em: {timestamp}</p>
+        # Só o resumo é interpolado; o cabeçalho com o CSS já está pronto em bytes
+        total = len(self.comparison_results)
+        identical = sum(1 for c in self.comparison_results if c.success)
+        different = total - identical
+        
+        summary_html = f"""        <h1>Relatório de Comparação de Endpoints</h1>
+        <p class="timestamp">Gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         
         <div class="summary">
             <h2>Resumo</h2>
@@ -1562,106 +1938,90 @@ class APIComparator:
             <p>Diferentes: <strong style="color: #dc3545;">{different}</strong></p>
         </div>
         
-        {comparisons}
-    </div>
-</body>
-</html>
-"""
-        
-        comparisons_html = ""
+        """
         
-        for result in self.comparison_results:
-            if not result.success:
-                comparison_html = f"""
+        # Gravação incremental: cada comparação é codificada e escrita ao final
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            write = f.write
+            write(_HTML_DETAILED_HEADER)
+            write(summary_html.encode('utf-8'))
+            
+            parts = []
+            for result in self.comparison_results:
+                if not result.success:
+                    parts.append(f"""
         <div class="comparison">
             <div class="comparison-header failure">
-                <h3>{html.escape(result.comparison_name)} <span class="badge badge-danger">DIFERENTES</span></h3>
+                <h3>{_esc(result.comparison_name)} <span class="badge badge-danger">DIFERENTES</span></h3>
             </div>
             
             <div class="endpoints">
-"""
+""")
                 
-                # Adicionar informações de cada endpoint
-                for endpoint in result.endpoints_results:
-                    status_class = self._get_status_class(endpoint['status_code'])
+                    # Adicionar informações de cada endpoint
+                    for endpoint in result.endpoints_results:
+                        status_class = self._get_status_class(endpoint['status_code'])
                     
-                    # Formatar body para exibição
-                    body_content = ""
-                    if isinstance(endpoint['body'], (dict, list)):
-                        body_content = json.dumps(endpoint['body'], indent=2, ensure_ascii=False)
-                    else:
-                        body_content = str(endpoint['body'])
+                        # Formatar body para exibição
+                        body_content = self._formatted_body(endpoint)
                     
-                    comparison_html += f"""
+                        parts.append(f"""
                 <div class="endpoint">
-                    <h4>{html.escape(endpoint['name'])}</h4>
+                    <h4>{_esc(endpoint['name'])}</h4>
                     <p>Status: <span class="status-code {status_class}">{endpoint['status_code']}</span></p>
                     <div class="json-content">
-                        <pre>{html.escape(body_content)}</pre>
+                        <pre>{_esc(body_content)}</pre>
                     </div>
                 </div>
-"""
+""")
                 
-                comparison_html += """
+                    parts.append("""
             </div>
-"""
+""")
                 
-                # Adicionar diferenças se houver
-                if result.comparison_details['differences'] and isinstance(result.comparison_details['differences'], list):
-                    comparison_html += """
+                    # Adicionar diferenças se houver
+                    if result.comparison_details['differences'] and isinstance(result.comparison_details['differences'], list):
+                        parts.append("""
             <div class="differences">
                 <h4>Diferenças Encontradas</h4>
-"""
+""")
                     
-                    for diff in result.comparison_details['differences']:
-                        comparison_html += f"""
+                        for diff in result.comparison_details['differences']:
+                            diff_text = _esc(_dumps_pretty(diff['diff']).decode('utf-8'))
+                            parts.append(f"""
                 <div class="diff-item">
-                    <div class="diff-type">Entre {html.escape(diff['endpoint1'])} e {html.escape(diff['endpoint2'])}</div>
+                    <div class="diff-type">Entre {_esc(diff['endpoint1'])} e {_esc(diff['endpoint2'])}</div>
                     <div class="diff-detail">
-                        <pre>{html.escape(json.dumps(diff['diff'], indent=2, ensure_ascii=False))}</pre>
+                        <pre>{diff_text}</pre>
                     </div>
                 </div>
-"""
+""")
                     
-                    comparison_html += """
+                        parts.append("""
             </div>
-"""
+""")
                 
-                comparison_html += """
+                    parts.append("""
         </div>
-"""
-                comparisons_html += comparison_html
-        
-        # Preencher template
-        total = len(self.comparison_results)
-        identical = sum(1 for c in self.comparison_results if c.success)
-        different = total - identical
-        
-        html_final = html_content.format(
-            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            total=total,
-            identical=identical,
-            different=different,
-            comparisons=comparisons_html
-        )
-        
-        # Salvar arquivo
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_final)
+""")
+                
+                write(''.join(parts).encode('utf-8'))
+                parts.clear()
+            
+            write(b"""
+    </div>
+</body>
+</html>
+""")
     
     def _get_status_class(self, status_code: int) -> str:
         """Retorna a classe CSS baseada no status code"""
-        if 200 <= status_code < 300:
-            return "status-2xx"
-        elif 300 <= status_code < 400:
-            return "status-3xx"
-        elif 400 <= status_code < 500:
-            return "status-4xx"
-        else:
-            return "status-5xx"
+        return _STATUS_CLASS.get(status_code // 100, "status-5xx")
     
     def cleanup(self):
         """Limpa recursos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         self.session.close()
 
 